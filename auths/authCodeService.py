@@ -0,0 +1,91 @@
+import hashlib
+import hmac
+import logging
+from datetime import datetime
+
+from auths.models import AuthCode
+from book import settings
+from cores.schema import ServiceError
+from cores.utils import generate_random_string, session_wrapper
+
+
+logger = logging.getLogger("django.server")
+
+def auth_code_digest(code) -> str:
+    # 인증번호는 원문 대신 HMAC-SHA256으로 저장
+    return hmac.new(settings.SECRET_KEY.encode(), code.encode(), hashlib.sha256).hexdigest()
+
+
+class AuthCodeService:
+    def issue_code(self, session, user_no) -> str:
+        """
+        인증번호 발급 (기존 인증번호는 덮어씀)
+        """
+        code = generate_random_string(5)
+
+        session.merge(AuthCode(
+            user_no=user_no,
+            code_digest=auth_code_digest(code),
+            attempts=0,
+            exp=datetime.utcnow() + settings.AUTH_CODE["EXP_DELTA"],
+        ))
+        session.commit()
+
+        return code
+
+    def check_code(self, session, user_no, code) -> None:
+        """
+        인증번호 확인 (만료/시도 횟수는 조회 시점에 검사)
+        """
+        if not (
+            auth_code := session.query(AuthCode)
+            .filter(AuthCode.user_no == user_no)
+            .first()
+        ):
+            raise ServiceError(400, "인증번호 불일치")
+
+        if auth_code.exp < datetime.utcnow():
+            session.delete(auth_code)
+            session.commit()
+            raise ServiceError(400, "인증번호가 만료되었습니다.")
+
+        if auth_code.attempts >= settings.AUTH_CODE["MAX_ATTEMPTS"]:
+            raise ServiceError(400, "인증 시도 횟수를 초과했습니다.")
+
+        if not hmac.compare_digest(auth_code.code_digest, auth_code_digest(code)):
+            session.query(AuthCode).filter(AuthCode.user_no == user_no).update(
+                {AuthCode.attempts: AuthCode.attempts + 1}, synchronize_session=False
+            )
+            session.commit()
+            raise ServiceError(400, "인증번호 불일치")
+
+        # 인증 성공한 인증번호는 재사용 불가
+        session.delete(auth_code)
+        session.commit()
+
+    @session_wrapper
+    def purge_expired_codes(self, session, batch_size: int = 1000) -> int:
+        """
+        만료된 AUTH_CODE 배치 삭제 (스케줄러에서 주기적으로 실행)
+        """
+        purged = 0
+        while True:
+            expired_user_nos = [
+                user_no for (user_no,) in session.query(AuthCode.user_no)
+                .filter(AuthCode.exp < datetime.utcnow())
+                .limit(batch_size)
+                .all()
+            ]
+            if not expired_user_nos:
+                break
+
+            session.query(AuthCode).filter(
+                AuthCode.user_no.in_(expired_user_nos)
+            ).delete(synchronize_session=False)
+            session.commit()
+            purged += len(expired_user_nos)
+
+        logger.info(f"purged {purged} expired auth codes")
+        return purged
+
+auth_code_service = AuthCodeService()
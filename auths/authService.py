@@ -1,48 +1,27 @@
 import logging
-import os
 
 from argon2.exceptions import VerifyMismatchError
-from django.utils import timezone
 
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
-from apscheduler.triggers.cron import CronTrigger
-from apscheduler.executors.pool import ThreadPoolExecutor, ProcessPoolExecutor
-import jwt
-from sqlalchemy import asc
-from tzlocal import get_localzone
+from sqlalchemy import asc, case, func
 
 from auths.models import RefreshToken, User
-from book import settings
-from book.models import Book, BookImage, BookRead
+from book.cascadeService import cascade_service
+from book.imageGcService import image_gc_service
+from book.models import Book
 from cores.schema import DataResp, HttpResp, ServiceError
-from cores.utils import GenericPayload, hash_password, send_email, session_wrapper, generate_random_string, generate_random_nick, reset_auth_number, verify_password
+from cores.utils import GenericPayload, count_cache, hash_password, password_needs_update, send_email, session_wrapper, generate_random_nick, verify_password
+from auths.authCodeService import auth_code_service
 from auths.tokenService import token_service
+from auths.userLoader import user_loader
+from garden.gardenCache import bump_user_garden_versions
+from garden.gardenCounter import garden_counter
 from garden.models import Garden, GardenUser
-from memo.models import Memo, MemoImage
+from memo.models import Memo
 from push.models import Push
 
 
 logger = logging.getLogger("django.server")
 
-# 스케쥴러 등록
-scheduler = BackgroundScheduler()
-jobstores = {
-    'default': SQLAlchemyJobStore(url=settings.SQLALCHEMY_DATABASE_URI)
-}
-executors = {
-  'default': ThreadPoolExecutor(20),
-  'processpool': ProcessPoolExecutor(5)
-}
-job_defaults = {
-  'coalesce': False,
-  'max_instances': 3
-}
-local_timezone = get_localzone()
-scheduler.configure(jobstores=jobstores, executors=executors, job_defaults=job_defaults, timezone=local_timezone)
-
-scheduler.start()
-
 class AuthService:
     @session_wrapper
     def create_user(self, session, payload: GenericPayload):
@@ -72,7 +51,8 @@ class AuthService:
             # 새로운 유저 객체 생성
             new_user = User(
                 **payload,
-                user_nick = generate_random_nick()
+                user_nick = generate_random_nick(),
+                user_garden_count = 1
             )
 
             # 세션에 추가
@@ -83,6 +63,7 @@ class AuthService:
                 "garden_title" : f'{new_user.user_nick}의 가든',
                 "garden_info" : '독서가든에 오신걸 환영합니다☺️',
                 "garden_color" : 'green',
+                "garden_member_count" : 1,
             }
             new_garden = Garden(
                 **new_garden_dict
@@ -131,6 +112,8 @@ class AuthService:
             return DataResp(
                 resp_code=201, resp_msg="회원가입 성공", data=response
             )
+        except ServiceError as e:
+            return HttpResp(resp_code=e.code, resp_msg=e.msg)
         except Exception as e:
             logger.error(e)
             raise e
@@ -157,6 +140,9 @@ class AuthService:
                     verify_password(payload['user_password'], user_instance.user_password)
                 ):
                     return HttpResp(resp_code=400, resp_msg="비밀번호가 일치하지 않습니다.")
+                # 작업 비용이 바뀐 해시는 로그인 성공 시 재해시
+                if password_needs_update(user_instance.user_password):
+                    user_instance.user_password = hash_password(payload['user_password'])
                 
             # 토큰 발급
             token_pair = token_service.generate_pair_token(user_instance)
@@ -167,30 +153,24 @@ class AuthService:
             session.add(user_instance)
             session.commit()
             session.refresh(user_instance)
+            user_loader.invalidate(user_instance.user_no)
 
             return DataResp(resp_code=200, resp_msg="로그인 성공", data=token_pair)
         except VerifyMismatchError as e:
             logger.error(e)
             session.rollback()
             return HttpResp(resp_code=400, resp_msg="아이디 또는 비밀번호가 일치하지 않습니다.")
+        except ServiceError as e:
+            return HttpResp(resp_code=e.code, resp_msg=e.msg)
         except Exception as e:
             logger.error(e)
             raise e
         
     @session_wrapper
-    def user_logout(self, session, request):
+    def user_logout(self, session, token_payload):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -206,17 +186,12 @@ class AuthService:
             session.add(user_instance)
             session.commit()
             session.refresh(user_instance)
+            user_loader.invalidate(user_instance.user_no)
 
             
             # token_service.revoke_refresh_token(token)
 
             return DataResp(resp_code=200, resp_msg="로그아웃 성공", data={})
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')    
         except Exception as e:
             logger.error(e)
             raise e
@@ -241,97 +216,69 @@ class AuthService:
             raise e 
         
     @session_wrapper
-    def user_delete(self, session, request):
+    def user_delete(self, session, token_payload):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
-            # 리프레시 인스턴스
-            refresh_token_instance = session.query(RefreshToken).filter(RefreshToken.
-            user_no == user_instance.user_no).first()
-
-            # 푸시 알림 인스턴스
-            push_instance = session.query(Push).filter(Push.user_no == user_instance.user_no).first()
+            # 가입된 가든 상세 변경 (멤버 목록, 책 목록)
+            bump_user_garden_versions(session, user_instance.user_no)
 
             # 가입된 가든 유저 인스턴스
             garden_user_instance = session.query(GardenUser).filter(GardenUser.user_no == user_instance.user_no).all()
 
+            # 가든별 책 수 (카운터 감소용)
+            for garden_no, book_count in (
+                session.query(Book.garden_no, func.count(Book.book_no))
+                .filter(Book.user_no == user_instance.user_no)
+                .group_by(Book.garden_no)
+                .all()
+            ):
+                garden_counter.change_garden_books(session, garden_no, -book_count)
+
             for garden_user in garden_user_instance:
                 # 리더인 경우 (개인 포함)
                 if garden_user.garden_leader:
                     
-                    # 리더인 가든의 멤버수
-                    garden_user_count = len(session.query(GardenUser).filter(GardenUser.garden_no == garden_user.garden_no).all())
-
-                    # 공유 가든 -> 리더 위임
-                    if garden_user_count > 1:
-                        # 가입된 가든 별 차기 리더
-                        garden_second_leader_instance = session.query(GardenUser).filter(GardenUser.garden_no == garden_user.garden_no, GardenUser.user_no != user_instance.user_no).order_by(asc(GardenUser.garden_sign_date)).first()
-                        
+                    # 공유 가든 -> 리더 위임 (가입된 가든 별 차기 리더)
+                    if (
+                        garden_second_leader_instance := session.query(GardenUser)
+                        .filter(GardenUser.garden_no == garden_user.garden_no, GardenUser.user_no != user_instance.user_no)
+                        .order_by(asc(GardenUser.garden_sign_date))
+                        .first()
+                    ):
                         garden_second_leader_instance.garden_leader = True
-
                         session.add(garden_second_leader_instance)
-                        session.commit()
-                        session.refresh(garden_second_leader_instance)
 
                     # 개인 가든 -> 삭제
                     else:
                         session.delete(garden_user)
+                        garden_counter.change_garden_members(session, garden_user.garden_no, -1)
                 # 리더가 아닌 경우 탈퇴
                 else:
                     session.delete(garden_user)
+                    garden_counter.change_garden_members(session, garden_user.garden_no, -1)
             
-            # 책 삭제
-            book_instance = session.query(Book).filter(Book.user_no == user_instance.user_no).all()
-            for book in book_instance:
-                # 책 기록 삭제
-                session.query(BookRead).filter(BookRead.book_no == book.book_no).delete()
-                # 책 이미지 삭제
-                book_image_instance = session.query(BookImage).filter(BookImage.book_no == book.book_no).first()
-                if book_image_instance:
-                    try:
-                        os.remove('images/'+book_image_instance.image_url)
-                        session.delete(book_image_instance)
-                    except FileNotFoundError:
-                        pass    
-                session.delete(book)
-            
-            # 메모 삭제
-            memo_instance = session.query(Memo).filter(Memo.user_no == user_instance.user_no).all()
-            for memo in memo_instance:
-                # 메모 이미지 삭제
-                memo_image_instance = session.query(MemoImage).filter(MemoImage.memo_no == memo.id).first()
-                if memo_image_instance:
-                    try:
-                        os.remove('images/'+memo_image_instance.image_url)
-                        session.delete(memo_image_instance)
-                    except FileNotFoundError:
-                        pass
-                session.delete(memo)
+            # 책 일괄 삭제 (독서 기록, 이미지, 메모 포함)
+            image_urls = cascade_service.delete_books(session, Book.user_no == user_instance.user_no)
+            # 남은 메모 일괄 삭제 (메모 이미지 포함)
+            image_urls += cascade_service.delete_memos(session, Memo.user_no == user_instance.user_no)
+
+            # 리프레시 토큰, 푸시 알림 삭제
+            session.query(RefreshToken).filter(RefreshToken.user_no == user_instance.user_no).delete(synchronize_session=False)
+            session.query(Push).filter(Push.user_no == user_instance.user_no).delete(synchronize_session=False)
                                             
             session.delete(user_instance)
-            session.delete(refresh_token_instance)
-            session.delete(push_instance)
             session.commit()
+            # 서버에 저장된 이미지 삭제 대기
+            image_gc_service.enqueue(session, image_urls)
+            user_loader.invalidate(user_instance.user_no)
+            count_cache.invalidate("book", user_instance.user_no)
+            count_cache.invalidate("memo", user_instance.user_no)
         
             return DataResp(resp_code=200, resp_msg="회원 탈퇴 성공", data={})
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')    
         except Exception as e:
             logger.error(e)
             raise e
@@ -347,32 +294,16 @@ class AuthService:
                 .first()
             ):
                 return HttpResp(resp_code=400, resp_msg="등록되지 않은 이메일 주소입니다.")
+            # db에 인증번호 저장 (만료 시각 포함, 만료된 인증번호는 주기적으로 일괄 삭제)
+            auth_number = auth_code_service.issue_code(session, user_instance.user_no)
+
             try:
-                auth_number = generate_random_string(5)
+                # 발송 큐에 넣고 바로 반환
                 send_email(email=payload['user_email'], title='[독서가든] 인증번호 안내드립니다', content=auth_number)
+            except ServiceError as e:
+                return HttpResp(resp_code=e.code, resp_msg=e.msg)
             except:
                 return HttpResp(resp_code=500, resp_msg="메일 전송 실패")
-            
-            reset_date = timezone.localtime(timezone.now()) + timezone.timedelta(minutes=5)
-            # logger.info(f"reset_date {reset_date.year, reset_date.month, reset_date.day, reset_date.hour, reset_date.minute}")
-            scheduler.add_job(
-                func=reset_auth_number,
-                args=[user_instance],
-                trigger=CronTrigger(
-                     year=str(reset_date.year),
-                     month=str(reset_date.month),
-                     day=str(reset_date.day),
-                     hour=str(reset_date.hour),
-                     minute=str(reset_date.minute),
-                ),
-            )
-            
-            # db에 인증번호 저장
-            user_instance.user_auth_number = auth_number
-
-            session.add(user_instance)
-            session.commit()
-            session.refresh(user_instance)
     
             return DataResp(resp_code=200, resp_msg="메일이 발송되었습니다. 확인해주세요.", data={})    
         except Exception as e:
@@ -384,12 +315,18 @@ class AuthService:
         self, session, payload: GenericPayload
     ):
         try:
-            user_instance = session.query(User).filter(User.user_email == payload['user_email']).first()
+            if not (
+                user_instance := session.query(User)
+                .filter(User.user_email == payload['user_email'])
+                .first()
+            ):
+                return HttpResp(resp_code=400, resp_msg="등록되지 않은 이메일 주소입니다.")
 
-            if user_instance.user_auth_number == payload['auth_number']:
-                 return DataResp(resp_code=200, resp_msg="인증 성공", data={})
-            else:
-                return HttpResp(resp_code=400, resp_msg="인증번호 불일치")
+            auth_code_service.check_code(session, user_instance.user_no, payload['auth_number'])
+
+            return DataResp(resp_code=200, resp_msg="인증 성공", data={})
+        except ServiceError as e:
+            return HttpResp(resp_code=e.code, resp_msg=e.msg)
         except Exception as e:
             logger.error(e)
             raise e
@@ -411,30 +348,24 @@ class AuthService:
             session.add(user_instance)
             session.commit()
             session.refresh(user_instance)
+            user_loader.invalidate(user_instance.user_no)
             return HttpResp(resp_code=200, resp_msg="비밀번호 변경 성공")
+        except ServiceError as e:
+            return HttpResp(resp_code=e.code, resp_msg=e.msg)
         except Exception as e:
             logger.error(e)
             raise e
         
     @session_wrapper
     def user_update_password(
-        self, session, request, payload: GenericPayload
+        self, session, token_payload, payload: GenericPayload
     ):
         """
         유저 비밀번호 변경 (토큰 O)
         """
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -444,13 +375,10 @@ class AuthService:
             session.add(user_instance)
             session.commit()
             session.refresh(user_instance)
+            user_loader.invalidate(user_instance.user_no)
             return HttpResp(resp_code=200, resp_msg="비밀번호 변경 성공")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
+        except ServiceError as e:
+            return HttpResp(resp_code=e.code, resp_msg=e.msg)
         except Exception as e:
             logger.error(e)
             raise e
@@ -458,31 +386,30 @@ class AuthService:
 
     @session_wrapper
     def get_user(
-        self, session, request
+        self, session, token_payload
     ):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
-            # Garden 개수
-            garden_count = (
-                len(session.query(GardenUser).filter(GardenUser.user_no == user_instance.user_no).all())
+            # Garden 개수, 읽은 책/읽고 싶은 책 개수 (한 번의 집계 쿼리)
+            garden_count_subquery = (
+                session.query(func.count(GardenUser.id))
+                .filter(GardenUser.user_no == user_instance.user_no)
+                .scalar_subquery()
+            )
+            garden_count, read_book_count, like_book_count = (
+                session.query(
+                    garden_count_subquery,
+                    func.count(case((Book.book_status == 1, 1))),
+                    func.count(case((Book.book_status == 2, 1))),
+                )
+                .select_from(Book)
+                .filter(Book.user_no == user_instance.user_no)
+                .one()
             )
-
-            book_query = session.query(Book).filter(Book.user_no == user_instance.user_no)
-            read_book_count = len(book_query.filter(Book.book_status == 1).all())
-            like_book_count = len(book_query.filter(Book.book_status == 2).all())
 
             result = {
                 "user_no": user_instance.user_no,
@@ -498,32 +425,17 @@ class AuthService:
                 "like_book_count": like_book_count,
             }
             return DataResp(resp_code=200, resp_msg="조회 성공", data=result)
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')    
         except Exception as e:
             logger.error(e)
             raise e
         
     @session_wrapper
     def update_user(
-        self, session, request, payload: GenericPayload
+        self, session, token_payload, payload: GenericPayload
     ):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -534,16 +446,13 @@ class AuthService:
                 user_instance.user_image = payload['user_image']
 
             session.add(user_instance)
+            # 가든 상세 멤버 목록의 닉네임, 프로필 이미지 변경
+            bump_user_garden_versions(session, user_instance.user_no)
             session.commit()
             session.refresh(user_instance)
+            user_loader.invalidate(user_instance.user_no)
             
-            return DataResp(resp_code=200, resp_msg="프로필 변경 성공", data=user_instance.as_dict(exclude="user_password"))
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')    
+            return DataResp(resp_code=200, resp_msg="프로필 변경 성공", data=user_instance.as_dict(exclude=["user_password", "user_garden_count"]))
         except Exception as e:
             logger.error(e)
             raise e
@@ -20,17 +20,27 @@ class User(AuthBase, UtilModel):
     user_image = Column(String(30), nullable=False, default='데이지')
     user_auth_number = Column(String(10), nullable=True)
     user_created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
+    # 개수 제한용 카운터 (가입된 GARDEN_USER 행 수)
+    user_garden_count = Column(Integer, nullable=False, default=0, server_default="0")
 
 class JWT(UtilModel):    
     abstract = True
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    user_no = Column(Integer, nullable=False)
+    user_no = Column(Integer, nullable=False, index=True)
     token = Column(Text)
-    exp = Column(DateTime(timezone=True))
+    # 토큰 SHA-256 hex digest (조회용 고정 길이 키)
+    token_digest = Column(String(64), nullable=True, unique=True)
+    exp = Column(DateTime(timezone=True), index=True)
 
 class RefreshToken(AuthBase, JWT):
     __tablename__ = "REFRESH_TOKEN"
 
-    
+class AuthCode(AuthBase, UtilModel):
+    __tablename__ = "AUTH_CODE"
 
+    # 비밀번호 찾기 인증번호 (유저당 1개)
+    user_no = Column(Integer, primary_key=True)
+    code_digest = Column(String(64), nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    exp = Column(DateTime(timezone=True), nullable=False, index=True)
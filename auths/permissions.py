@@ -13,11 +13,12 @@ logger = logging.getLogger("django.server")
 
 class UserAuth(HttpBearer):
     def authenticate(self, request: HttpRequest, token: str):
+        """
+        access token을 한 번만 검증하고 payload를 request.auth로 넘김
+        """
         try:
-            token_service.verify_access_token(token)
-            return token
-        except ExpiredSignatureError:
+            return token_service.verify_access_token(token)
+        except ExpiredSignatureError as e:
             logger.error(f"Expired token supplied to {request.path}")
-            return {'error': ExpiredSignatureError}
-            # raise ExpiredSignatureError
+            raise e
         
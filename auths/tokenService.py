@@ -1,3 +1,4 @@
+import hashlib
 import logging
 from datetime import datetime
 
@@ -39,6 +40,11 @@ def jwt_decoder(token) -> dict:
     )
 
 
+def token_digest(token) -> str:
+    # 토큰 조회용 SHA-256 digest
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
 class TokenService:
     @session_wrapper
     def generate_pair_token(self, session, user) -> dict:
@@ -75,20 +81,15 @@ class TokenService:
             settings.JWT["JWT_REFRESH_EXP_DELTA"],
             "REFRESH",
         )
-        # 이미 DB에 있는 Refresh Token 삭제
-        if (
-            old_refreshs := session.query(RefreshToken)
-            .filter(
-                RefreshToken.user_no == user.user_no
-            ).all()
-        ):
-            for old_refresh in old_refreshs:
-                session.delete(old_refresh)
+        # 이미 DB에 있는 Refresh Token 삭제 (단일 DELETE)
+        session.query(RefreshToken).filter(
+            RefreshToken.user_no == user.user_no
+        ).delete(synchronize_session=False)
                 
-        # Refresh Token DB 저장
+        # Refresh Token DB 저장 (원문 대신 digest 저장)
         rt = RefreshToken(
             user_no=user.user_no,
-            token=refresh_token,
+            token_digest=token_digest(refresh_token),
             exp=datetime.utcnow() + settings.JWT["JWT_REFRESH_EXP_DELTA"],
         )
         session.add(rt)
@@ -163,14 +164,28 @@ class TokenService:
             if token_payload['type'] != TokenTypeEnum.REFRESH.value:
                 raise jwt.InvalidTokenError
             
-            # REFRESH_TOKEN 테이블에 없으면 에러
+            # REFRESH_TOKEN 테이블에 없으면 에러 (digest unique index 조회)
+            digest = token_digest(payload['refresh_token'])
             if not (
             refresh_token := session.query(RefreshToken)
-            .filter(
-                RefreshToken.user_no == int(token_payload["user_no"]),
-                RefreshToken.token == payload['refresh_token']
-            ).first()
+            .filter(RefreshToken.token_digest == digest)
+            .first()
             ):
+                # digest 도입 이전에 저장된 토큰은 원문으로 조회 후 digest 채움
+                if not (
+                refresh_token := session.query(RefreshToken)
+                .filter(
+                    RefreshToken.user_no == int(token_payload["user_no"]),
+                    RefreshToken.token_digest.is_(None),
+                    RefreshToken.token == payload['refresh_token']
+                ).first()
+                ):
+                    raise jwt.InvalidTokenError
+                refresh_token.token_digest = digest
+                refresh_token.token = None
+                session.commit()
+
+            if refresh_token.user_no != int(token_payload["user_no"]):
                 raise jwt.InvalidTokenError
             
             # 만료시 DB에서 삭제 후 에러
@@ -191,5 +206,30 @@ class TokenService:
             logger.error(e)
             raise e 
 
+    @session_wrapper
+    def purge_expired_refresh_tokens(self, session, batch_size: int = 1000) -> int:
+        """
+        만료된 REFRESH_TOKEN 배치 삭제 (스케줄러에서 주기적으로 실행)
+        """
+        purged = 0
+        while True:
+            expired_ids = [
+                id for (id,) in session.query(RefreshToken.id)
+                .filter(RefreshToken.exp < datetime.utcnow())
+                .limit(batch_size)
+                .all()
+            ]
+            if not expired_ids:
+                break
+
+            session.query(RefreshToken).filter(
+                RefreshToken.id.in_(expired_ids)
+            ).delete(synchronize_session=False)
+            session.commit()
+            purged += len(expired_ids)
+
+        logger.info(f"purged {purged} expired refresh tokens")
+        return purged
+
 token_service = TokenService()
 
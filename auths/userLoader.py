@@ -0,0 +1,45 @@
+import logging
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from auths.models import User
+from book import settings
+from cores.cache import TTLCache
+
+
+logger = logging.getLogger("django.server")
+
+# user_no -> USER 컬럼 스냅샷
+user_cache = TTLCache(
+    maxsize=settings.USER_CACHE["MAXSIZE"],
+    ttl=settings.USER_CACHE["TTL"].total_seconds(),
+)
+
+class UserLoader:
+    def get_user(self, session, user_no):
+        """
+        현재 유저 조회 (캐시에 있으면 DB 조회 없이 세션에 연결해서 반환)
+        """
+        if (snapshot := user_cache.get(user_no)) is not None:
+            user_instance = User(**snapshot)
+            # 조회된 객체처럼 만들어 세션에 연결 (SELECT 없음)
+            make_transient_to_detached(user_instance)
+            return session.merge(user_instance, load=False)
+
+        if not (
+            user_instance := session.query(User)
+            .filter(User.user_no == user_no)
+            .first()
+        ):
+            return None
+
+        user_cache.set(user_no, user_instance.as_dict())
+        return user_instance
+
+    def invalidate(self, user_no):
+        """
+        유저 정보가 변경되면 캐시 삭제
+        """
+        user_cache.delete(user_no)
+
+user_loader = UserLoader()
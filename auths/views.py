@@ -47,7 +47,7 @@ class RefreshTokenSchema(Schema, BaseModel):
    
 
 @router.post("/",
-             response={201: DataResp, 409: HttpResp, 500: HttpResp}, 
+             response={201: DataResp, 409: HttpResp, 500: HttpResp, 503: HttpResp}, 
              summary="유저 회원가입")
 def create_user(request, form: CreateUserSchema):
     """
@@ -58,7 +58,7 @@ def create_user(request, form: CreateUserSchema):
 
 @router.post(
    "/login",
-   response={200: DataResp, 400: HttpResp, 500: HttpResp},
+   response={200: DataResp, 400: HttpResp, 500: HttpResp, 503: HttpResp},
    summary="유저 로그인"
 )
 def login(request, form: LoginUserSchema):
@@ -79,7 +79,7 @@ def logout(request):
    로그아웃 (FCM 토큰 삭제)
    """
    logger.info(f"Call logout API")
-   return RETURN_FUNC(auth_service.user_logout(request))
+   return RETURN_FUNC(auth_service.user_logout(request.auth))
 
 @router.post(
     "/refresh",
@@ -104,12 +104,12 @@ def delete_user(request):
    유저 회원 탈퇴
    """
    logger.info(f"Call delete_user API")
-   return RETURN_FUNC(auth_service.user_delete(request))
+   return RETURN_FUNC(auth_service.user_delete(request.auth))
 
 
 @router.post(
     "/find-password",
-    response={200: DataResp, 400: HttpResp, 403: HttpResp, 500: HttpResp},
+    response={200: DataResp, 400: HttpResp, 403: HttpResp, 500: HttpResp, 503: HttpResp},
     summary="유저 비밀번호 인증 메일 전송"
 )
 def find_password(request, form: UserEmailSchema):
@@ -132,7 +132,7 @@ def auth_check(request, form: UserPasswordAuthSchema):
 
 @router.put(
     "/find-password/update-password",
-    response={200: HttpResp, 400: HttpResp, 403: HttpResp, 500: HttpResp},
+    response={200: HttpResp, 400: HttpResp, 403: HttpResp, 500: HttpResp, 503: HttpResp},
     summary="유저 비밀번호 변경 (토큰 X)"
 )
 def update_password_no_token(request, form: UpdateUserPasswordSchema):
@@ -144,14 +144,14 @@ def update_password_no_token(request, form: UpdateUserPasswordSchema):
 @router.put(
     "/update-password",
     auth=UserAuth(),
-    response={200: HttpResp, 400: HttpResp, 403: HttpResp, 500: HttpResp},
+    response={200: HttpResp, 400: HttpResp, 403: HttpResp, 500: HttpResp, 503: HttpResp},
     summary="유저 비밀번호 변경 (토큰 O)"
 )
 def update_password(request, form: UpdateUserPasswordSchema):
     """
     Update Password With Token
     """
-    return RETURN_FUNC(auth_service.user_update_password(request, form.dict()))
+    return RETURN_FUNC(auth_service.user_update_password(request.auth, form.dict()))
 
 @router.get(
     "/",
@@ -164,7 +164,7 @@ def get_user(request):
     프로필 조회
     """
     logger.info(f"Call get_user API")
-    return RETURN_FUNC(auth_service.get_user(request))
+    return RETURN_FUNC(auth_service.get_user(request.auth))
 
 @router.put(
     "/",
@@ -177,5 +177,5 @@ def update_user(request, form: UpdateUserSchema):
     프로필 수정
     """
     logger.info(f"Call update_user API")
-    return RETURN_FUNC(auth_service.update_user(request, form.dict()))
+    return RETURN_FUNC(auth_service.update_user(request.auth, form.dict()))
 
@@ -0,0 +1,174 @@
+import json
+import logging
+import random
+import re
+import time
+import requests
+
+from requests.adapters import HTTPAdapter
+
+from book import settings
+from cores.breaker import CircuitBreaker
+from cores.cache import StaleWhileRevalidateCache
+from cores.metrics import LatencyHistogram
+from cores.schema import ServiceError
+from cores.singleflight import SingleFlight
+
+
+logger = logging.getLogger("django.server")
+
+ALADIN_API_URL = "http://www.aladin.co.kr/ttb/api"
+
+# keep-alive 연결을 재사용하는 공용 세션
+aladin_session = requests.Session()
+aladin_session.mount("http://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=settings.ALADIN_HTTP["POOL_SIZE"],
+))
+aladin_breaker = CircuitBreaker(
+    failure_threshold=settings.ALADIN_HTTP["BREAKER_FAILURES"],
+    reset_timeout=settings.ALADIN_HTTP["BREAKER_RESET"].total_seconds(),
+)
+aladin_latency = LatencyHistogram()
+# 같은 검색어/ISBN 동시 요청은 알라딘 호출 1회로 합침
+aladin_flight = SingleFlight()
+
+# 알라딘 응답 캐시 (검색어/ISBN 기준)
+aladin_search_cache = StaleWhileRevalidateCache(maxsize=settings.ALADIN_CACHE["SEARCH_MAXSIZE"])
+aladin_lookup_cache = StaleWhileRevalidateCache(maxsize=settings.ALADIN_CACHE["LOOKUP_MAXSIZE"])
+
+# 응답/캐시에 남기는 필드 (나머지 알라딘 필드는 버림)
+RESPONSE_FIELDS = (
+    "totalResults", "startIndex", "itemsPerPage", "query",
+    "searchCategoryId", "searchCategoryName", "errorCode", "errorMessage",
+)
+ITEM_FIELDS = (
+    "itemId", "isbn", "isbn13", "title", "author", "publisher", "pubDate",
+    "description", "cover", "link", "categoryName", "priceStandard",
+)
+SUB_INFO_FIELDS = ("subTitle", "itemPage")
+
+def normalize_query(query: str) -> str:
+    # 앞뒤/중복 공백 제거
+    return " ".join(query.split())
+
+def normalize_isbn(isbn: str) -> str:
+    # 하이픈, 공백 등 제거
+    return re.sub(r"[^0-9Xx]", "", isbn).upper()
+
+def trim_response(response_json: dict) -> dict:
+    # 엔드포인트에서 쓰는 필드만 남김
+    trimmed = {key: response_json[key] for key in RESPONSE_FIELDS if key in response_json}
+    trimmed["item"] = []
+    for item in response_json.get("item") or []:
+        trimmed_item = {key: item[key] for key in ITEM_FIELDS if key in item}
+        if (sub_info := item.get("subInfo")):
+            trimmed_item["subInfo"] = {key: sub_info[key] for key in SUB_INFO_FIELDS if key in sub_info}
+        trimmed["item"].append(trimmed_item)
+    return trimmed
+
+def is_not_found(response_json: dict) -> bool:
+    # 검색 결과 없음 / 존재하지 않는 ISBN
+    return not response_json.get("item")
+
+
+class AladinClient:
+    def _get(self, endpoint: str, params: dict) -> dict:
+        # 알라딘 장애 중이면 바로 실패 (캐시/카탈로그에 있는 데이터는 호출 전에 반환됨)
+        if not aladin_breaker.allow():
+            raise ServiceError(503, "알라딘 서비스가 원활하지 않습니다. 잠시 후 다시 시도해주세요.")
+
+        # 모든 경로에서 결과 기록 (half-open 시험 호출이 결과 없이 끝나면 계속 차단됨)
+        try:
+            response_json = self._request(endpoint, params)
+        except BaseException:
+            aladin_breaker.record_failure()
+            raise
+        aladin_breaker.record_success()
+        return response_json
+
+    def _request(self, endpoint: str, params: dict) -> dict:
+        max_retries = settings.ALADIN_HTTP["MAX_RETRIES"]
+        for attempt in range(max_retries + 1):
+            started_at = time.perf_counter()
+            try:
+                book_response = aladin_session.get(
+                    f"{ALADIN_API_URL}/{endpoint}",
+                    params={
+                        "ttbkey": settings.ALADIN_TTBKEY,
+                        "Cover": "Big",
+                        "output": "js",
+                        "Version": "20131101",
+                        **params,
+                    },
+                    timeout=(settings.ALADIN_HTTP["CONNECT_TIMEOUT"], settings.ALADIN_HTTP["READ_TIMEOUT"]),
+                )
+                book_response.raise_for_status()
+                # JSON 형식의 텍스트 데이터를 파이썬 딕셔너리로 변환합니다.
+                response_json = json.loads(book_response.text)
+            except (requests.RequestException, ValueError) as e:
+                aladin_latency.observe(time.perf_counter() - started_at)
+                logger.error(f"aladin {endpoint} failed ({attempt + 1}/{max_retries + 1}): {e}")
+                if attempt < max_retries:
+                    # 지수 백오프 + jitter
+                    backoff = settings.ALADIN_HTTP["BACKOFF"] * (2 ** attempt)
+                    time.sleep(backoff + random.uniform(0, backoff))
+                continue
+
+            aladin_latency.observe(time.perf_counter() - started_at)
+            return response_json
+
+        raise ServiceError(503, "알라딘 서비스가 원활하지 않습니다. 잠시 후 다시 시도해주세요.")
+
+    def metrics(self) -> dict:
+        return {
+            "breaker": aladin_breaker.state,
+            "latency": aladin_latency.snapshot(),
+        }
+
+    def _cached(self, cache, key, loader, ttl):
+        return cache.get_or_load(
+            key,
+            lambda: aladin_flight.do(key, lambda: trim_response(loader())),
+            ttl=ttl.total_seconds(),
+            stale_ttl=settings.ALADIN_CACHE["STALE_TTL"].total_seconds(),
+            negative_ttl=settings.ALADIN_CACHE["NOT_FOUND_TTL"].total_seconds(),
+            is_negative=is_not_found,
+        )
+
+    def search(self, query: str, start: int, max_results: int) -> dict:
+        """
+        키워드 검색 (ItemSearch)
+        """
+        query = normalize_query(query)
+        params = {
+            "Query": query,
+            "QueryType": "Keyword",
+            "MaxResults": max_results,
+            "Start": start,
+            "SearchTarget": "BOOK",
+        }
+        return self._cached(
+            aladin_search_cache,
+            ("search", query.lower(), start, max_results),
+            lambda: self._get("ItemSearch.aspx", params),
+            settings.ALADIN_CACHE["SEARCH_TTL"],
+        )
+
+    def lookup(self, isbn: str, id_type: str = "ISBN13") -> dict:
+        """
+        ISBN 조회 (ItemLookUp)
+        """
+        isbn = normalize_isbn(isbn)
+        params = {
+            "ItemIdType": id_type,
+            "ItemId": isbn,
+        }
+        return self._cached(
+            aladin_lookup_cache,
+            ("lookup", id_type, isbn),
+            lambda: self._get("ItemLookUp.aspx", params),
+            settings.ALADIN_CACHE["LOOKUP_TTL"],
+        )
+
+aladin_client = AladinClient()
@@ -1,21 +1,24 @@
 
-import json
 import logging
-import os
-import secrets
 import jwt
-import requests
 
-from sqlalchemy import desc, or_
+from sqlalchemy import or_
 
 from datetime import datetime
-from auths.models import User
-from auths.tokenService import token_service
+from auths.userLoader import user_loader
+from book.aladinClient import aladin_client
+from book.catalogService import catalog_service
 from book import settings
 from book.models import Book, BookImage, BookRead
-from cores.schema import DataResp, HttpResp
-
-from cores.utils import GenericPayload, pagination, session_wrapper
+from book.cascadeService import cascade_service
+from book.imageGcService import image_gc_service
+from book.imageStore import image_store, thumbnail_urls
+from book.readProgress import latest_current_pages, read_percent
+from garden.gardenCache import bump_garden_version
+from garden.gardenCounter import garden_counter
+from cores.schema import DataResp, HttpResp, ServiceError
+
+from cores.utils import GenericPayload, count_cache, cursor_pagination, pagination, session_wrapper
 from garden.models import Garden, GardenUser
 from memo.models import Memo, MemoImage
 
@@ -26,15 +29,12 @@ class BookService:
     @session_wrapper
     def get_book(self, session, request, query: str, start: int, maxResults: int):
         try:
-            KEY = settings.ALADIN_TTBKEY
-            URL = f"http://www.aladin.co.kr/ttb/api/ItemSearch.aspx?ttbkey={KEY}&Query={query}&QueryType=Keyword&MaxResults={maxResults}&Start={start}&Cover=Big&SearchTarget=BOOK&output=js&Version=20131101"
-
-            book_response = requests.get(URL)
-            # JSON 형식의 텍스트 데이터를 파이썬 딕셔너리로 변환합니다.
-            response_json = json.loads(book_response.text)
+            response_json = aladin_client.search(query, start, maxResults)
 
             return DataResp(
                     resp_code=200, resp_msg="책 검색 성공", data=response_json)
+        except ServiceError as e:
+            return HttpResp(resp_code=e.code, resp_msg=e.msg)
         except (
             jwt.ExpiredSignatureError,
             jwt.InvalidTokenError,
@@ -49,15 +49,13 @@ class BookService:
     @session_wrapper
     def get_isbn_book(self, session, request, query: str):
         try:
-            KEY = settings.ALADIN_TTBKEY
-            URL = f"http://www.aladin.co.kr/ttb/api/ItemLookUp.aspx?ttbkey={KEY}&ItemIdType=ISBN&ItemId={query}&Cover=Big&output=js&Version=20131101&"
-
-            book_response = requests.get(URL)
-            # JSON 형식의 텍스트 데이터를 파이썬 딕셔너리로 변환합니다.
-            response_json = json.loads(book_response.text)
+            # 카탈로그 우선 조회
+            response_json = catalog_service.lookup(session, query, id_type="ISBN")
 
             return DataResp(
                     resp_code=200, resp_msg="책 검색(ISBN) 성공", data=response_json)
+        except ServiceError as e:
+            return HttpResp(resp_code=e.code, resp_msg=e.msg)
         except (
             jwt.ExpiredSignatureError,
             jwt.InvalidTokenError,
@@ -69,18 +67,35 @@ class BookService:
             raise e
         
 
+    @session_wrapper
+    def get_book_batch(self, session, request, payload: GenericPayload):
+        """
+        책 일괄 조회 (ISBN 여러 개)
+        """
+        try:
+            if len(payload['isbns']) > settings.BOOK_LOOKUP_BATCH["MAX_ISBNS"]:
+                return HttpResp(resp_code=400, resp_msg=f"ISBN은 최대 {settings.BOOK_LOOKUP_BATCH['MAX_ISBNS']}개까지 조회할 수 있습니다.")
+
+            results = catalog_service.lookup_many(session, payload['isbns'])
+
+            return DataResp(
+                    resp_code=200, resp_msg="책 일괄 조회 성공", data=[
+                        {'isbn': isbn, **result}
+                        for isbn, result in results.items()
+                    ])
+        except Exception as e:
+            logger.error(e)
+            raise e
+        
+
     @session_wrapper
     def get_book_detail(self, session, request, query: str):
         """
         책 상세 조회
         """
         try:
-            KEY = settings.ALADIN_TTBKEY
-            URL = f"http://www.aladin.co.kr/ttb/api/ItemLookUp.aspx?ttbkey={KEY}&itemIdType=ISBN13&ItemId={query}&Cover=Big&output=js&Version=20131101"
-            
-            book_response = requests.get(URL)
-            # JSON 형식의 텍스트 데이터를 파이썬 딕셔너리로 변환합니다.
-            response_json = json.loads(book_response.text)
+            # 카탈로그 우선 조회
+            response_json = catalog_service.lookup(session, query, id_type="ISBN13")
 
             result = {
                 'searchCategoryId': response_json['searchCategoryId'],
@@ -102,6 +117,8 @@ class BookService:
 
             return DataResp(
                     resp_code=200, resp_msg="책 상세 조회 성공", data=result)
+        except ServiceError as e:
+            return HttpResp(resp_code=e.code, resp_msg=e.msg)
         except (
             jwt.ExpiredSignatureError,
             jwt.InvalidTokenError,
@@ -114,19 +131,10 @@ class BookService:
     
     
     @session_wrapper
-    def get_book_duplication(self, session, request, isbn: str):
+    def get_book_duplication(self, session, token_payload, isbn: str):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -139,31 +147,16 @@ class BookService:
                 return HttpResp(resp_code=403, resp_msg="책 중복")
             
             return HttpResp(resp_code=200, resp_msg="책 등록 가능")
-        except (
-        jwt.ExpiredSignatureError,
-        jwt.InvalidTokenError,
-        jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')    
         except Exception as e:
             logger.error(e)
             raise e
 
 
     @session_wrapper
-    def create_book(self, session, request, payload: GenericPayload):
+    def create_book(self, session, token_payload, payload: GenericPayload):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -175,10 +168,8 @@ class BookService:
             ) and (payload['garden_no'] is not None):
                 return HttpResp(resp_code=400, resp_msg="일치하는 가든이 없습니다.")
             
-            # 책 개수 가져오기
-            garden_book_instance_count = len(session.query(Book).filter(Book.garden_no == payload['garden_no']).all())
-            
-            if garden_book_instance_count < 30 :
+            # 가든 책 개수 제한 (카운터 조건부 증가)
+            if garden_counter.acquire_garden_books(session, payload['garden_no']):
                 # 새로운 책 객체 생성
 
                 new_book = Book(
@@ -187,37 +178,28 @@ class BookService:
                 )
 
                 session.add(new_book)
+                bump_garden_version(session, payload['garden_no'])
                 session.commit()
                 session.refresh(new_book)
+                count_cache.invalidate("book", user_instance.user_no)
+
+                # 카탈로그에 없는 책이면 백그라운드에서 채움
+                catalog_service.fill_in_background(new_book.book_isbn)
 
                 return DataResp(resp_code=201, resp_msg="책 등록 성공", data=   {'book_no':new_book.book_no})
             else:
+                session.rollback()
                 return HttpResp(resp_code=403, resp_msg="책 생성 개수 초과")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
         
 
     @session_wrapper
-    def delete_book(self, session, request, book_no: int):
+    def delete_book(self, session, token_payload, book_no: int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -226,60 +208,27 @@ class BookService:
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 책 정보가 없습니다.")
 
-            # 책 기록 삭제
-            book_read_instance = session.query(BookRead).filter(BookRead.book_no == book_no).delete()
-            
-            # 책 이미지 삭제
-            image_instance = session.query(BookImage).filter(BookImage.book_no == book_no).first()
-            if image_instance:
-                # 서버, DB 저장된 이미지 삭제
-                try:
-                    os.remove('images/'+image_instance.image_url)
-                    session.delete(image_instance)
-                except FileNotFoundError:
-                    pass
-
-            # 메모 삭제 및 메모 이미지도 같이
-            memo_instance = session.query(Memo).filter(Memo.book_no == book_no).all()
-            for memo in memo_instance:
-                memo_image_instance = session.query(MemoImage).filter(MemoImage.memo_no == memo.id).first()
-                if memo_image_instance:
-                    try:
-                        os.remove('images/'+memo_image_instance.image_url)
-                        session.delete(memo_image_instance)
-                    except FileNotFoundError:
-                        pass
-                session.delete(memo)
-
-            session.delete(book_instance)
+            # 책 기록, 책 이미지, 메모, 메모 이미지 일괄 삭제
+            image_urls = cascade_service.delete_books(session, Book.book_no == book_instance.book_no)
+            garden_counter.change_garden_books(session, book_instance.garden_no, -1)
+            bump_garden_version(session, book_instance.garden_no)
             session.commit()
+            # 서버에 저장된 이미지 삭제 대기
+            image_gc_service.enqueue(session, image_urls)
+            count_cache.invalidate("book", user_instance.user_no)
+            count_cache.invalidate("memo", user_instance.user_no)
 
             return HttpResp(resp_code=200, resp_msg="책 삭제 성공")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
         
 
     @session_wrapper
-    def update_book(self, session, request, payload:GenericPayload,  book_no:int):
+    def update_book(self, session, token_payload, payload:GenericPayload,  book_no:int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -288,12 +237,17 @@ class BookService:
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 책 정보가 없습니다.")
             
-            if payload['garden_no']:
-                # 책 옮기기
-                book_instance2 = session.query(Book).filter(Book.garden_no == payload['garden_no']).all() # 도착지 가든의 책 인스턴스
-                # 도착지 가든 + 현재 책 합 30개 이하만 가능
-                if len(book_instance2) == 30:
+            if payload['garden_no'] and payload['garden_no'] != book_instance.garden_no:
+                # 기존 가든, 도착지 가든 행 잠금 (데드락 방지를 위해 번호 순)
+                garden_counter.lock_gardens(session, book_instance.garden_no, payload['garden_no'])
+                # 책 옮기기 - 도착지 가든 책 30개 이하만 가능 (카운터 조건부 증가)
+                if not garden_counter.acquire_garden_books(session, payload['garden_no']):
+                    session.rollback()
                     return HttpResp(resp_code=403, resp_msg="가든 옮기기 불가")
+                garden_counter.change_garden_books(session, book_instance.garden_no, -1)
+
+            # 기존 가든, 옮길 가든 상세 변경
+            bump_garden_version(session, book_instance.garden_no, payload['garden_no'])
 
             for key, value in payload.items():
                 if value is not None:
@@ -302,33 +256,20 @@ class BookService:
             session.add(book_instance)
             session.commit()
             session.refresh(book_instance)
+            # 가든, 상태 필터별 total 변경
+            count_cache.invalidate("book", user_instance.user_no)
 
             return HttpResp(resp_code=200, resp_msg="책 수정 성공")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
         
     
     @session_wrapper
-    def get_book_status(self, session, request, garden_no:int=None, status:int=None, page:int=1, page_size:int=10):
+    def get_book_status(self, session, token_payload, garden_no:int=None, status:int=None, page:int=1, page_size:int=10, cursor:str=None, use_cursor:bool=False, include_total:bool=True):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -353,21 +294,23 @@ class BookService:
                     .filter(Book.user_no == user_instance.user_no, Book.book_status == status)
                     )
 
-            # 페이지네이션 적용 (예: 1페이지, 페이지당 10개 항목)
-            pagination_result = pagination(book_query, page=page, page_size=page_size)
+            # total은 사용자 + 필터 단위로 캐시 (include_total=false면 count 생략)
+            total = count_cache.count("book", user_instance.user_no, (garden_no, status), book_query) if include_total else None
+
+            if use_cursor or cursor:
+                # 커서 페이지네이션 (book_no 순)
+                pagination_result = cursor_pagination(book_query, [(Book.book_no, False)], cursor, page_size, include_total, total)
+            else:
+                # 페이지네이션 적용 (예: 1페이지, 페이지당 10개 항목)
+                pagination_result = pagination(book_query.order_by(Book.book_no), page=page, page_size=page_size, include_total=include_total, total=total)
             
+            # 책별 최근 독서 기록 (한 번에 조회)
+            current_pages = latest_current_pages(session, [book.book_no for book in pagination_result['list']])
+
             # 페이지네이션된 결과에서 책 리스트 추출
             book_status_list = []            
             for book in pagination_result['list']:
-                percent = 0.0
-                if (
-                        book_read_instance := 
-                        session.query(BookRead)
-                        .filter(BookRead.book_no == book.book_no)
-                        .order_by(desc(BookRead.created_at))
-                        .first()
-                    ):
-                        percent = (book_read_instance.book_current_page/book.book_page)*100
+                percent = read_percent(current_pages.get(book.book_no), book.book_page)
 
                 book_status_list.append({
                     'book_no': book.book_no,
@@ -391,52 +334,51 @@ class BookService:
                 })
 
             # 최종 결과에 페이지네이션 정보 추가
-            result = {
-               "current_page": pagination_result["current_page"],
-               "max_page": pagination_result["max_page"],
-               "total_items": pagination_result["total"],
-               "page_size": pagination_result["page_size"],
-               "list": book_status_list
-            }
+            if use_cursor or cursor:
+                result = {
+                   "next_cursor": pagination_result["next_cursor"],
+                   "has_next": pagination_result["has_next"],
+                   "total_items": pagination_result["total"],
+                   "page_size": pagination_result["page_size"],
+                   "list": book_status_list
+                }
+            else:
+                result = {
+                   "current_page": pagination_result["current_page"],
+                   "max_page": pagination_result["max_page"],
+                   "total_items": pagination_result["total"],
+                   "page_size": pagination_result["page_size"],
+                   "list": book_status_list
+                }
             
             return DataResp(resp_code=200, resp_msg="책 상태 조회 성공", data=result)
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
+        except ServiceError as e:
+            return HttpResp(resp_code=e.code, resp_msg=e.msg)
         except Exception as e:
             logger.error(e)
             raise e
     
     @session_wrapper
-    def get_read(self, session, request, book_no:int):
+    def get_read(self, session, token_payload, book_no:int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
-            # Book, Garden join
+            # Book, Garden, BookRead join (독서 기록 최신순, 기록이 없으면 BookRead는 None인 1행)
             if not (
-                book_garden_instance := session.query(Book, Garden)
+                book_read_rows := session.query(Book, Garden, BookRead)
                 .join(Garden, Book.garden_no == Garden.garden_no)
+                .outerjoin(BookRead, BookRead.book_no == Book.book_no)
                 .filter(Book.book_no == book_no)
-                .first()
+                .order_by(BookRead.created_at.desc(), BookRead.id.desc())
+                .all()
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 책 정보가 없습니다.")
             
-            book, garden = book_garden_instance
+            book, garden, _ = book_read_rows[0]
+            book_read_instances = [book_read for _, _, book_read in book_read_rows if book_read is not None]
 
             result = {
                 'garden_no': garden.garden_no,
@@ -461,23 +403,17 @@ class BookService:
                 'user_no': book.user_no
             }
             
-            # 쿼리에서 조건에 맞는 BookRead 인스턴스를 찾습니다.
-            book_read_query = (
-                session.query(BookRead)
-                .filter(BookRead.book_no == book_no)
-            )
             result['book_read_list'] = []
 
             # 결과가 있을 경우
-            if book_read_query.first():
-                # 가장 최근의 BookRead 인스턴스를 가져옵니다.
-                book_read_instance = book_read_query.order_by(BookRead.created_at.desc()).first()
+            if book_read_instances:
+                # 가장 최근의 BookRead 인스턴스
+                book_read_instance = book_read_instances[0]
 
                 result['book_current_page'] = book_read_instance.book_current_page
-                result['percent'] = (book_read_instance.book_current_page/book.book_page)*100
+                result['percent'] = read_percent(book_read_instance.book_current_page, book.book_page)
 
                 # 독서 기록 리스트                
-                book_read_instances = book_read_query.order_by(BookRead.created_at.desc()).all()
                 result['book_read_list'] = [
                     {
                         'id': book_read.id,
@@ -489,46 +425,41 @@ class BookService:
                     for book_read in book_read_instances
                 ]
 
-            # 메모 리스트
-            memo_instance = session.query(Memo).filter(Memo.book_no == book.book_no).order_by(Memo.memo_like.desc(), Memo.memo_created_at.desc()).all()
-            result['memo_list'] = [
-                {
-                    'id': memo.id,
-                    'memo_content': memo.memo_content,
-                    # 'memo_quote': memo.memo_quote,
-                    'memo_like': memo.memo_like,
-                    'memo_created_at': memo.memo_created_at
-                }
-                for memo in memo_instance
-            ]
+            # 메모 리스트 (Memo, MemoImage outer join)
+            memo_image_rows = (
+                session.query(Memo, MemoImage.image_url, MemoImage.thumbnail_ready)
+                .outerjoin(MemoImage, MemoImage.memo_no == Memo.id)
+                .filter(Memo.book_no == book.book_no)
+                .order_by(Memo.memo_like.desc(), Memo.memo_created_at.desc(), Memo.id.desc(), MemoImage.id.asc())
+                .all()
+            )
+            memo_list = {}
+            for memo, image_url, thumbnail_ready in memo_image_rows:
+                # 메모당 이미지가 여러 행이면 첫 이미지만 사용
+                if memo.id not in memo_list:
+                    memo_list[memo.id] = {
+                        'id': memo.id,
+                        'memo_content': memo.memo_content,
+                        # 'memo_quote': memo.memo_quote,
+                        'memo_like': memo.memo_like,
+                        'image_url': image_url,
+                        'thumbnail_urls': thumbnail_urls(image_url, thumbnail_ready),
+                        'memo_created_at': memo.memo_created_at
+                    }
+            result['memo_list'] = list(memo_list.values())
 
             
             return DataResp(resp_code=200, resp_msg="독서 기록 조회 성공", data=result)
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
         
         
     @session_wrapper
-    def create_read(self, session, request, payload: GenericPayload):
+    def create_read(self, session, token_payload, payload: GenericPayload):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -561,7 +492,10 @@ class BookService:
                 session.add(book_instance)  
 
             session.add(new_read)
+            bump_garden_version(session, book_instance.garden_no)
             session.commit()
+            # 책 상태 변경 시 상태 필터별 total 변경
+            count_cache.invalidate("book", user_instance.user_no)
             
             percent = 0.0
 
@@ -572,30 +506,15 @@ class BookService:
                 'book_current_page': payload['book_current_page'],
                 'percent': percent
             })
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
 
     @session_wrapper
-    def update_read(self, session, request, payload: GenericPayload, id:int):
+    def update_read(self, session, token_payload, payload: GenericPayload, id:int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
 
@@ -614,31 +533,16 @@ class BookService:
             session.refresh(book_read_instance)
                 
             return HttpResp(resp_code=200, resp_msg="독서 기록 수정 성공")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
 
 
     @session_wrapper
-    def delete_read(self, session, request, id:int):
+    def delete_read(self, session, token_payload, id:int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
 
@@ -647,34 +551,24 @@ class BookService:
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 책 기록이 없습니다.")
 
+            # 책 진행률 변경
+            bump_garden_version(
+                session,
+                session.query(Book.garden_no).filter(Book.book_no == book_read_instance.book_no).scalar()
+            )
             session.delete(book_read_instance)
             session.commit()
                 
             return HttpResp(resp_code=200, resp_msg="책 기록 삭제 성공")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
 
     @session_wrapper
-    def upload_book_image(self, session, request, book_no:int, file):
+    def upload_book_image(self, session, token_payload, book_no:int, file):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -683,37 +577,19 @@ class BookService:
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 책이 없습니다.")
 
-            # 해당 책에 이미지 있으면
+            # 임시 파일 스트리밍 저장 -> 형식 확인 -> rename
+            image_url = image_store.save(file, settings.BOOK_IMAGE_DIR, 'book/')
+
+            # 해당 책에 이미지 있으면 DB에서 삭제 (서버 파일은 커밋 후 삭제 대기)
+            old_image_urls = []
             if (
                 image_instance := session.query(BookImage)
                 .filter(BookImage.book_no == book_no)
                 .first()
             ):  
-                # 서버, DB 저장된 이미지 삭제
-                os.remove('images/'+image_instance.image_url)
+                old_image_urls.append(image_instance.image_url)
                 session.delete(image_instance)
-                session.commit()
             
-            image_folder = settings.BOOK_IMAGE_DIR
-
-            try:
-                os.mkdir(image_folder)
-            except FileExistsError:
-                pass
-
-            if file.size > (5 * 1024 * 1024):
-                return HttpResp(resp_code=400, resp_msg="이미지 용량은 5MB를 초과할 수 없습니다.")
-                
-            name, ext = os.path.splitext(file.name) # 파일 이름에서 확장자를 분리
-            image_name = secrets.token_urlsafe(16) + ext # URL 안전한 임의의 문자열을 생성
-            image_path = image_folder + "/" + image_name
-
-            with open(image_path, 'wb+') as f:
-                for chunk in file.chunks():
-                    f.write(chunk)
-
-            image_url = 'book/' + image_name
-
             new_image = BookImage(
                 book_no = book_no,
                 image_name = file.name,
@@ -723,33 +599,23 @@ class BookService:
             session.add(new_image)
             session.commit()
             session.refresh(new_image)
+            image_gc_service.enqueue(session, old_image_urls)
+            # 이미지 행 커밋 후 썸네일 생성 (완료되면 thumbnail_ready 표시)
+            image_store.make_thumbnails_later(image_url)
 
             return HttpResp(resp_code=201, resp_msg="이미지 업로드 성공")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
+        except ServiceError as e:
+            return HttpResp(resp_code=e.code, resp_msg=e.msg)
         except Exception as e:
             logger.error(e)
             raise e
         
     
     @session_wrapper
-    def delete_book_image(self, session, request, book_no:int):
+    def delete_book_image(self, session, token_payload, book_no:int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -766,18 +632,13 @@ class BookService:
             ):  
                 return HttpResp(resp_code=400, resp_msg="일치하는 이미지가 없습니다.")
             
-            # 서버, DB 저장된 이미지 삭제
-            os.remove('images/'+image_instance.image_url)
+            # DB 저장된 이미지 삭제 (서버 파일은 커밋 후 삭제 대기)
+            image_url = image_instance.image_url
             session.delete(image_instance)
             session.commit()
+            image_gc_service.enqueue(session, [image_url])
 
             return HttpResp(resp_code=201, resp_msg="이미지 삭제 성공")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
@@ -0,0 +1,71 @@
+import logging
+
+from sqlalchemy import delete, select
+
+from book.models import Book, BookImage, BookRead
+from memo.models import Memo, MemoImage
+
+
+logger = logging.getLogger("django.server")
+
+
+class CascadeService:
+    """
+    책/메모 연쇄 삭제
+
+    행 단위 SELECT + session.delete 대신 테이블별 DELETE ... WHERE ... IN (subquery)를
+    의존 순서대로 실행한다 (문장 수는 행 수와 무관하게 테이블 수만큼).
+    커밋은 호출한 쪽 트랜잭션에서 하고, 반환된 이미지 경로는 커밋 후 image_gc_service.enqueue로 넘긴다.
+    """
+    def delete_books(self, session, *conditions) -> list:
+        """
+        conditions에 맞는 책과 독서 기록, 책 이미지, 메모, 메모 이미지 삭제
+
+        삭제된 이미지의 image_url 리스트 반환
+        """
+        book_nos = select(Book.book_no).where(*conditions)
+        memo_ids = select(Memo.id).where(Memo.book_no.in_(book_nos))
+
+        image_urls = self._image_urls(session, book_nos, memo_ids)
+
+        for statement in (
+            delete(MemoImage).where(MemoImage.memo_no.in_(memo_ids)),
+            delete(Memo).where(Memo.book_no.in_(book_nos)),
+            delete(BookImage).where(BookImage.book_no.in_(book_nos)),
+            delete(BookRead).where(BookRead.book_no.in_(book_nos)),
+            delete(Book).where(*conditions),
+        ):
+            session.execute(statement, execution_options={"synchronize_session": False})
+
+        return image_urls
+
+    def delete_memos(self, session, *conditions) -> list:
+        """
+        conditions에 맞는 메모와 메모 이미지 삭제
+
+        삭제된 이미지의 image_url 리스트 반환
+        """
+        memo_ids = select(Memo.id).where(*conditions)
+
+        image_urls = list(session.scalars(
+            select(MemoImage.image_url).where(MemoImage.memo_no.in_(memo_ids))
+        ))
+
+        for statement in (
+            delete(MemoImage).where(MemoImage.memo_no.in_(memo_ids)),
+            delete(Memo).where(*conditions),
+        ):
+            session.execute(statement, execution_options={"synchronize_session": False})
+
+        return image_urls
+
+    def _image_urls(self, session, book_nos, memo_ids) -> list:
+        book_image_urls = session.scalars(
+            select(BookImage.image_url).where(BookImage.book_no.in_(book_nos))
+        )
+        memo_image_urls = session.scalars(
+            select(MemoImage.image_url).where(MemoImage.memo_no.in_(memo_ids))
+        )
+        return [*book_image_urls, *memo_image_urls]
+
+cascade_service = CascadeService()
@@ -0,0 +1,164 @@
+import json
+import logging
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from sqlalchemy.exc import IntegrityError
+
+from book import settings
+from book.aladinClient import aladin_client, is_not_found, normalize_isbn
+from book.models import BookCatalog
+from cores.schema import ServiceError
+from cores.utils import session_wrapper
+
+
+logger = logging.getLogger("django.server")
+
+# create_book 이후 카탈로그 채우기용
+catalog_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="book-catalog")
+# 일괄 조회 시 알라딘 동시 호출 수 제한
+lookup_executor = ThreadPoolExecutor(
+    max_workers=settings.BOOK_LOOKUP_BATCH["MAX_CONCURRENCY"], thread_name_prefix="book-lookup"
+)
+
+
+class CatalogService:
+    def get(self, session, isbn13: str):
+        """
+        카탈로그에 저장된 알라딘 응답 조회
+        """
+        if not (
+            catalog_instance := session.query(BookCatalog)
+            .filter(BookCatalog.isbn13 == isbn13)
+            .first()
+        ):
+            return None
+        return json.loads(catalog_instance.aladin_response)
+
+    def save(self, session, response_json: dict):
+        """
+        알라딘 조회 결과를 카탈로그에 저장 (있으면 갱신)
+        """
+        item = response_json['item'][0]
+        if not (isbn13 := item.get('isbn13')):
+            return
+
+        session.merge(BookCatalog(
+            isbn13=isbn13,
+            title=item['title'],
+            author=item.get('author', ''),
+            publisher=item.get('publisher', ''),
+            description=item.get('description', ''),
+            cover=item.get('cover'),
+            item_page=item.get('subInfo', {}).get('itemPage'),
+            aladin_response=json.dumps(response_json, ensure_ascii=False),
+            updated_at=datetime.utcnow(),
+        ))
+        try:
+            session.commit()
+        except IntegrityError:
+            # 동시에 같은 ISBN이 저장된 경우
+            session.rollback()
+
+    def lookup(self, session, isbn: str, id_type: str = "ISBN13") -> dict:
+        """
+        카탈로그 우선 조회, 없으면 알라딘 조회 후 저장
+        """
+        isbn = normalize_isbn(isbn)
+        if len(isbn) == 13 and (response_json := self.get(session, isbn)) is not None:
+            return response_json
+
+        response_json = aladin_client.lookup(isbn, id_type=id_type)
+        if not is_not_found(response_json):
+            self.save(session, response_json)
+        return response_json
+
+    def lookup_many(self, session, isbns: list) -> dict:
+        """
+        ISBN 일괄 조회 (카탈로그 1회 조회 후 없는 것만 알라딘 병렬 조회)
+
+        ISBN별 결과를 {isbn: {resp_code, resp_msg, data}} 형태로 반환
+        """
+        isbns = list(dict.fromkeys(normalize_isbn(isbn) for isbn in isbns if isbn))
+        results = {}
+
+        # 카탈로그에 있는 책
+        for catalog_instance in (
+            session.query(BookCatalog)
+            .filter(BookCatalog.isbn13.in_([isbn for isbn in isbns if len(isbn) == 13]))
+            .all()
+        ):
+            results[catalog_instance.isbn13] = {
+                'resp_code': 200,
+                'resp_msg': "책 검색(ISBN) 성공",
+                'data': json.loads(catalog_instance.aladin_response),
+            }
+
+        # 없는 책은 알라딘 병렬 조회 (응답 캐시 / 동시 요청 합치기 적용)
+        futures = {
+            lookup_executor.submit(aladin_client.lookup, isbn, "ISBN13" if len(isbn) == 13 else "ISBN"): isbn
+            for isbn in isbns if isbn not in results
+        }
+        for future in as_completed(futures):
+            isbn = futures[future]
+            try:
+                response_json = future.result()
+            except ServiceError as e:
+                results[isbn] = {'resp_code': e.code, 'resp_msg': e.msg, 'data': None}
+                continue
+            except Exception as e:
+                logger.error(f"book lookup failed for {isbn}: {e}")
+                results[isbn] = {'resp_code': 500, 'resp_msg': "책 검색(ISBN) 실패", 'data': None}
+                continue
+
+            if is_not_found(response_json):
+                results[isbn] = {'resp_code': 404, 'resp_msg': "일치하는 책이 없습니다.", 'data': None}
+                continue
+
+            # 세션은 요청 스레드에서만 사용
+            self.save(session, response_json)
+            results[isbn] = {'resp_code': 200, 'resp_msg': "책 검색(ISBN) 성공", 'data': response_json}
+
+        return {isbn: results[isbn] for isbn in isbns}
+
+    def fill_in_background(self, isbn: str):
+        """
+        카탈로그에 없는 책이면 백그라운드에서 알라딘 조회 후 저장
+        """
+        if isbn:
+            catalog_executor.submit(self._fill, isbn)
+
+    @session_wrapper
+    def _fill(self, session, isbn: str):
+        try:
+            self.lookup(session, isbn)
+        except Exception as e:
+            logger.error(f"book catalog fill failed for {isbn}: {e}")
+
+    @session_wrapper
+    def refresh_stale(self, session, batch_size: int = 100) -> int:
+        """
+        오래된 카탈로그 항목 갱신 (스케줄러에서 주기적으로 실행)
+        """
+        stale_isbns = [
+            isbn13 for (isbn13,) in session.query(BookCatalog.isbn13)
+            .filter(BookCatalog.updated_at < datetime.utcnow() - settings.BOOK_CATALOG["REFRESH_AFTER"])
+            .order_by(BookCatalog.updated_at.asc())
+            .limit(batch_size)
+            .all()
+        ]
+
+        refreshed = 0
+        for isbn13 in stale_isbns:
+            try:
+                response_json = aladin_client.lookup(isbn13, id_type="ISBN13")
+                if not is_not_found(response_json):
+                    self.save(session, response_json)
+                    refreshed += 1
+            except Exception as e:
+                logger.error(f"book catalog refresh failed for {isbn13}: {e}")
+
+        logger.info(f"refreshed {refreshed}/{len(stale_isbns)} book catalog entries")
+        return refreshed
+
+catalog_service = CatalogService()
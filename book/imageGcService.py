@@ -0,0 +1,152 @@
+import logging
+import os
+import time
+
+from sqlalchemy import insert
+
+from book import settings
+from book.imageStore import THUMBNAIL_DIR, thumbnail_url
+from book.models import BookImage, PendingFile
+from cores.utils import session_wrapper
+from memo.models import MemoImage
+
+
+logger = logging.getLogger("django.server")
+
+
+def image_path(image_url: str) -> str:
+    # 저장된 image_url -> 서버 파일 경로
+    return 'images/'+image_url
+
+
+class ImageGcService:
+    """
+    이미지 파일 지연 삭제
+
+    요청에서는 커밋 후 삭제할 경로를 PENDING_FILE에 기록만 하고,
+    스케줄러의 collect가 배치로 파일을 지운다.
+    """
+    def enqueue(self, session, image_urls: list):
+        """
+        삭제할 이미지 경로 기록 (호출한 쪽 세션에서 DB 커밋 이후 호출)
+
+        실패해도 요청은 이미 커밋됐으므로 로그만 남김 (남은 파일은 reconcile이 회수)
+        """
+        if not image_urls:
+            return
+        try:
+            session.execute(insert(PendingFile), [{"image_url": image_url} for image_url in image_urls])
+            session.commit()
+        except Exception as e:
+            session.rollback()
+            logger.error(f"image gc enqueue failed for {len(image_urls)} files: {e}")
+
+    @session_wrapper
+    def collect(self, session, batch_size: int = settings.IMAGE_GC["BATCH_SIZE"]) -> int:
+        """
+        PENDING_FILE 배치 삭제 (스케줄러에서 주기적으로 실행)
+        """
+        removed = 0
+        # 한 번 실행에서 각 행은 한 번만 시도 (실패한 행은 다음 실행에서 재시도)
+        last_id = 0
+        while True:
+            pending_files = (
+                session.query(PendingFile)
+                .filter(
+                    PendingFile.attempts < settings.IMAGE_GC["MAX_ATTEMPTS"],
+                    PendingFile.id > last_id,
+                )
+                .order_by(PendingFile.id)
+                .limit(batch_size)
+                .all()
+            )
+            if not pending_files:
+                break
+            last_id = pending_files[-1].id
+
+            done_ids = []
+            for pending_file in pending_files:
+                try:
+                    # 원본과 썸네일 삭제
+                    for path in [
+                        image_path(pending_file.image_url),
+                        *[image_path(thumbnail_url(pending_file.image_url, size)) for size in settings.IMAGE_UPLOAD["THUMBNAIL_SIZES"]],
+                    ]:
+                        try:
+                            os.remove(path)
+                        except FileNotFoundError:
+                            pass
+                    done_ids.append(pending_file.id)
+                except OSError as e:
+                    logger.error(e)
+                    pending_file.attempts += 1
+
+            if done_ids:
+                session.query(PendingFile).filter(
+                    PendingFile.id.in_(done_ids)
+                ).delete(synchronize_session=False)
+            session.commit()
+            removed += len(done_ids)
+
+            # 배치 전체가 실패하면 (권한 오류 등) 다음 실행까지 중단
+            if not done_ids or len(pending_files) < batch_size:
+                break
+
+        logger.info(f"removed {removed} pending image files")
+        return removed
+
+    @session_wrapper
+    def reconcile(self, session, batch_size: int = settings.IMAGE_GC["BATCH_SIZE"]) -> int:
+        """
+        images/book, images/memo 중 BOOK_IMAGE/MEMO_IMAGE에 없는 고아 파일을 PENDING_FILE에 기록
+
+        썸네일(thumb/)은 원본 이미지가 참조되지 않을 때 고아로 판단
+        """
+        expired_at = time.time() - settings.IMAGE_GC["ORPHAN_GRACE"].total_seconds()
+        orphans = []
+
+        for image_dir, prefix, model in (
+            (settings.BOOK_IMAGE_DIR, 'book/', BookImage),
+            (settings.MEMO_IMAGE_DIR, 'memo/', MemoImage),
+        ):
+            # (파일 image_url, 참조 여부를 확인할 원본 image_url)
+            entries = []
+            for folder, url_prefix, to_source in (
+                (image_dir, prefix, lambda name: name),
+                # abc.jpg.200.webp -> abc.jpg
+                (os.path.join(image_dir, THUMBNAIL_DIR), prefix + THUMBNAIL_DIR + '/', lambda name: name.rsplit('.', 2)[0]),
+            ):
+                try:
+                    entries += [
+                        (url_prefix + entry.name, prefix + to_source(entry.name))
+                        for entry in os.scandir(folder)
+                        if entry.is_file() and entry.stat().st_mtime < expired_at
+                    ]
+                except FileNotFoundError:
+                    continue
+
+            for i in range(0, len(entries), batch_size):
+                batch = entries[i:i + batch_size]
+                referenced = {
+                    image_url for (image_url,) in session.query(model.image_url)
+                    .filter(model.image_url.in_({source_url for _, source_url in batch}))
+                    .all()
+                }
+                orphans += [image_url for image_url, source_url in batch if source_url not in referenced]
+
+        # 이미 삭제 대기 중인 파일 제외
+        for i in range(0, len(orphans), batch_size):
+            image_urls = orphans[i:i + batch_size]
+            pending = {
+                image_url for (image_url,) in session.query(PendingFile.image_url)
+                .filter(PendingFile.image_url.in_(image_urls))
+                .all()
+            }
+            if (new_orphans := [image_url for image_url in image_urls if image_url not in pending]):
+                session.execute(insert(PendingFile), [{"image_url": image_url} for image_url in new_orphans])
+        session.commit()
+
+        logger.info(f"found {len(orphans)} orphan image files")
+        return len(orphans)
+
+image_gc_service = ImageGcService()
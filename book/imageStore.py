@@ -0,0 +1,170 @@
+import logging
+import os
+import secrets
+import tempfile
+
+from concurrent.futures import ThreadPoolExecutor
+from PIL import Image, ImageOps
+from sqlalchemy import update
+
+from book import settings
+from book.models import BookImage
+from cores.schema import ServiceError
+from cores.utils import session_wrapper
+from memo.models import MemoImage
+
+
+logger = logging.getLogger("django.server")
+
+# 썸네일 생성용 (요청 스레드에서 이미지 디코딩하지 않음)
+thumbnail_executor = ThreadPoolExecutor(
+    max_workers=settings.IMAGE_UPLOAD["MAX_WORKERS"], thread_name_prefix="image-thumbnail"
+)
+
+THUMBNAIL_DIR = 'thumb'
+
+
+def detect_image_ext(head: bytes):
+    # 파일 앞부분(magic bytes)으로 이미지 형식 확인
+    if head.startswith(b'\xff\xd8\xff'):
+        return '.jpg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return '.png'
+    if head[:6] in (b'GIF87a', b'GIF89a'):
+        return '.gif'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return '.webp'
+    return None
+
+
+def thumbnail_url(image_url: str, size: int) -> str:
+    # book/abc.jpg -> book/thumb/abc.jpg.200.webp
+    folder, name = image_url.rsplit('/', 1)
+    return f"{folder}/{THUMBNAIL_DIR}/{name}.{size}.webp"
+
+
+def thumbnail_urls(image_url: str, thumbnail_ready: bool):
+    # 리스트 응답용 썸네일 URL (크기별), 썸네일 생성 전이면 원본 URL
+    if not image_url:
+        return None
+    return {
+        str(size): thumbnail_url(image_url, size) if thumbnail_ready else image_url
+        for size in settings.IMAGE_UPLOAD["THUMBNAIL_SIZES"]
+    }
+
+
+class ImageStore:
+    """
+    이미지 업로드
+
+    임시 파일로 스트리밍 저장하면서 용량을 제한하고, magic bytes로 형식을 확인한 뒤
+    최종 경로로 rename (원자적). 썸네일은 이미지 행 커밋 후 워커 풀에서 WebP로 생성하고
+    BOOK_IMAGE/MEMO_IMAGE.thumbnail_ready로 표시한다.
+    """
+    def save(self, file, image_dir: str, url_prefix: str) -> str:
+        """
+        업로드 파일 저장 후 image_url 반환 (용량 초과, 지원하지 않는 형식은 ServiceError(400))
+        """
+        os.makedirs(image_dir, exist_ok=True)
+
+        max_bytes = settings.IMAGE_UPLOAD["MAX_BYTES"]
+        fd, temp_path = tempfile.mkstemp(dir=image_dir, suffix='.part')
+        try:
+            size = 0
+            head = b''
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in file.chunks():
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise ServiceError(400, f"이미지 용량은 {max_bytes // (1024 * 1024)}MB를 초과할 수 없습니다.")
+                    if len(head) < 12:
+                        head += chunk[:12 - len(head)]
+                    f.write(chunk)
+                f.flush()
+                os.fsync(f.fileno())
+
+            if not (ext := detect_image_ext(head)):
+                raise ServiceError(400, "지원하지 않는 이미지 형식입니다.")
+
+            # 확장자는 업로드 파일명이 아닌 실제 형식 기준
+            image_name = secrets.token_urlsafe(16) + ext
+            os.replace(temp_path, os.path.join(image_dir, image_name))
+        except BaseException:
+            try:
+                os.remove(temp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        return url_prefix + image_name
+
+    def make_thumbnails_later(self, image_url: str):
+        """
+        썸네일 백그라운드 생성 (이미지 행 커밋 이후 호출)
+        """
+        thumbnail_executor.submit(self._make_thumbnails_task, image_url)
+
+    @session_wrapper
+    def _make_thumbnails_task(self, session, image_url: str):
+        if self.make_thumbnails(image_url):
+            self._mark_ready(session, [image_url])
+            session.commit()
+
+    def _mark_ready(self, session, image_urls: list):
+        for model, prefix in ((BookImage, 'book/'), (MemoImage, 'memo/')):
+            if (urls := [image_url for image_url in image_urls if image_url.startswith(prefix)]):
+                session.execute(
+                    update(model).where(model.image_url.in_(urls)).values(thumbnail_ready=True),
+                    execution_options={"synchronize_session": False}
+                )
+
+    def make_thumbnails(self, image_url: str) -> bool:
+        """
+        썸네일 생성 (이미 있으면 건너뜀), 성공 여부 반환
+        """
+        try:
+            source_path = 'images/'+image_url
+            with Image.open(source_path) as image:
+                image = ImageOps.exif_transpose(image)
+                if image.mode not in ('RGB', 'RGBA'):
+                    image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+
+                for size in settings.IMAGE_UPLOAD["THUMBNAIL_SIZES"]:
+                    path = 'images/'+thumbnail_url(image_url, size)
+                    if os.path.exists(path):
+                        continue
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+                    thumbnail = image.copy()
+                    thumbnail.thumbnail((size, size))
+                    # 임시 파일에 저장 후 rename
+                    temp_path = path + '.part'
+                    thumbnail.save(temp_path, 'WEBP', quality=settings.IMAGE_UPLOAD["THUMBNAIL_QUALITY"])
+                    os.replace(temp_path, path)
+            return True
+        except Exception as e:
+            logger.error(f"thumbnail failed {image_url}: {e}")
+            return False
+
+    @session_wrapper
+    def backfill_thumbnails(self, session, batch_size: int = 500) -> int:
+        """
+        thumbnail_ready가 아닌 이미지 썸네일 생성 후 표시 (스케줄러에서 주기적으로 실행)
+        """
+        count = 0
+        for model in (BookImage, MemoImage):
+            image_urls = [
+                image_url for (image_url,) in session.query(model.image_url)
+                .filter(model.thumbnail_ready.is_(False))
+                .all()
+            ]
+            for i in range(0, len(image_urls), batch_size):
+                if (ready_urls := [image_url for image_url in image_urls[i:i + batch_size] if self.make_thumbnails(image_url)]):
+                    self._mark_ready(session, ready_urls)
+                    session.commit()
+                    count += len(ready_urls)
+
+        logger.info(f"backfilled thumbnails for {count} images")
+        return count
+
+image_store = ImageStore()
@@ -42,4 +42,30 @@ class BookImage(BookBase, UtilModel):
     book_no = Column(Integer, nullable=False)
     image_name = Column(Text, nullable=False)
     image_url = Column(Text, nullable=False)
-    image_created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
\ No newline at end of file
+    # 썸네일 생성 완료 여부 (리스트 응답에서 파일 확인 없이 썸네일 URL 사용)
+    thumbnail_ready = Column(Boolean, nullable=False, default=False, server_default="0")
+    image_created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
+
+
+class BookCatalog(BookBase, UtilModel):
+    __tablename__ = "BOOK_CATALOG"
+
+    # 알라딘 조회 결과 (ISBN13 기준)
+    isbn13 = Column(String(13), primary_key=True)
+    title = Column(String(300), nullable=False)
+    author = Column(String(300), nullable=False, default='')
+    publisher = Column(String(100), nullable=False, default='')
+    description = Column(Text, nullable=False, default='')
+    cover = Column(Text, nullable=True)
+    item_page = Column(Integer, nullable=True)
+    aladin_response = Column(Text, nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=func.now(), onupdate=func.now(), nullable=False, index=True)
+
+class PendingFile(BookBase, UtilModel):
+    __tablename__ = "PENDING_FILE"
+
+    # 삭제 대기 중인 이미지 파일 (images/ 기준 경로)
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    image_url = Column(Text, nullable=False)
+    attempts = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
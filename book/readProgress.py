@@ -0,0 +1,40 @@
+from sqlalchemy import and_, func
+
+from book.models import BookRead
+
+
+def latest_current_pages(session, book_nos: list) -> dict:
+    """
+    책별 가장 최근 독서 기록의 current page를 한 번의 쿼리로 조회
+
+    {book_no: book_current_page} 형태로 반환 (기록이 없는 책은 제외)
+    """
+    if not book_nos:
+        return {}
+
+    latest_read = (
+        session.query(
+            BookRead.book_no,
+            func.max(BookRead.created_at).label("created_at")
+        )
+        .filter(BookRead.book_no.in_(book_nos))
+        .group_by(BookRead.book_no)
+        .subquery()
+    )
+    rows = (
+        session.query(BookRead.book_no, BookRead.book_current_page)
+        .join(latest_read, and_(
+            BookRead.book_no == latest_read.c.book_no,
+            BookRead.created_at == latest_read.c.created_at
+        ))
+        # created_at이 같으면 id가 큰 기록 사용
+        .order_by(BookRead.id.asc())
+        .all()
+    )
+    return {book_no: book_current_page for book_no, book_current_page in rows}
+
+
+def read_percent(current_page, book_page) -> float:
+    if not current_page or not book_page:
+        return 0.0
+    return (current_page/book_page)*100
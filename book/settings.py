@@ -101,6 +101,62 @@ JWT = {
     "JWT_REFRESH_EXP_DELTA": timedelta(weeks=60),
 }
 
+# 현재 유저 캐시 (워커 프로세스별 인메모리)
+USER_CACHE = {
+    "MAXSIZE": 10000,
+    "TTL": timedelta(seconds=30),
+}
+
+# 개수 제한
+GARDEN_LIMIT = {
+    "GARDENS_PER_USER": 5,
+    "MEMBERS_PER_GARDEN": 10,
+    "BOOKS_PER_GARDEN": 30,
+}
+
+# 가든 상세 응답 캐시 (GARDEN.garden_version이 같을 때만 사용)
+GARDEN_DETAIL_CACHE = {
+    "MAXSIZE": 5000,
+    "TTL": timedelta(minutes=10),
+}
+
+# 이미지 업로드 (용량 제한, 썸네일)
+IMAGE_UPLOAD = {
+    "MAX_BYTES": 5 * 1024 * 1024,
+    "THUMBNAIL_SIZES": (200, 600),
+    "THUMBNAIL_QUALITY": 80,
+    "MAX_WORKERS": 2,
+}
+
+# 이미지 파일 정리 (PENDING_FILE 배치 삭제, 고아 파일 회수)
+IMAGE_GC = {
+    "BATCH_SIZE": 500,
+    "MAX_ATTEMPTS": 5,
+    # 업로드 중인 파일을 고아로 판단하지 않도록 이 시간보다 오래된 파일만 회수
+    "ORPHAN_GRACE": timedelta(hours=1),
+}
+
+# 목록 API total 캐시 (사용자 + 필터 단위, 워커 프로세스별 인메모리)
+COUNT_CACHE = {
+    "MAXSIZE": 10000,
+    "TTL": timedelta(seconds=60),
+}
+
+# 비밀번호 찾기 인증번호
+AUTH_CODE = {
+    "EXP_DELTA": timedelta(minutes=5),
+    "MAX_ATTEMPTS": 5,
+}
+
+# 비밀번호 해시 스레드 풀 / bcrypt 작업 비용 보정
+PASSWORD_HASHER = {
+    "MAX_WORKERS": 4,
+    "MAX_PENDING": 16,
+    "TARGET_TIME": timedelta(milliseconds=250),
+    "MIN_ROUNDS": 10,
+    "MAX_ROUNDS": 14,
+}
+
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
@@ -180,8 +236,49 @@ USE_TZ = True
 # 이메일 계정
 EMAIL_ACCOUNT = env('EMAIL_ACCOUNT')
 EMAIL_PASSWORD = env('EMAIL_PASSWORD')
+# 메일 발송 큐 (SMTP 연결 유지)
+EMAIL_SMTP = {
+    "HOST": "smtp.gmail.com",
+    "PORT": 465,
+    # 연결/응답 대기 시간 (초)
+    "TIMEOUT": 10,
+    "MAX_QUEUE": 1000,
+    "BATCH_SIZE": 20,
+    "MAX_RETRIES": 5,
+    "IDLE_TIMEOUT": timedelta(seconds=60),
+}
 # 알라딘 TTBKEY
 ALADIN_TTBKEY = env("ALADIN_TTBKEY")
+# 알라딘 HTTP 클라이언트 (타임아웃/재시도/서킷 브레이커)
+ALADIN_HTTP = {
+    "POOL_SIZE": 10,
+    "CONNECT_TIMEOUT": 2,
+    "READ_TIMEOUT": 5,
+    "MAX_RETRIES": 2,
+    "BACKOFF": 0.2,
+    "BREAKER_FAILURES": 5,
+    "BREAKER_RESET": timedelta(seconds=30),
+}
+# 알라딘 응답 캐시
+ALADIN_CACHE = {
+    # 검색 결과는 항목당 최대 MaxResults권이라 ISBN 조회보다 적게 보관
+    "SEARCH_MAXSIZE": 500,
+    "LOOKUP_MAXSIZE": 5000,
+    "SEARCH_TTL": timedelta(minutes=10),
+    "LOOKUP_TTL": timedelta(hours=24),
+    "NOT_FOUND_TTL": timedelta(minutes=5),
+    # 만료 후 이 기간 동안은 이전 응답을 반환하면서 백그라운드 갱신
+    "STALE_TTL": timedelta(hours=1),
+}
+# 책 카탈로그 (ISBN13 기준 알라딘 조회 결과 저장)
+BOOK_CATALOG = {
+    "REFRESH_AFTER": timedelta(days=30),
+}
+# ISBN 일괄 조회
+BOOK_LOOKUP_BATCH = {
+    "MAX_ISBNS": 50,
+    "MAX_CONCURRENCY": 5,
+}
 
 
 # Static files (CSS, JavaScript, Images)
@@ -1,5 +1,5 @@
 import logging
-
+import jwt
 
 from django.urls import path
 from django.conf.urls.static import static
@@ -7,6 +7,7 @@ from ninja import NinjaAPI
 
 from auths.views import router as auth_router
 from book import settings
+from cores.schema import HttpResp
 from garden.views import router as garden_router
 from book.views import router as book_router
 from memo.views import router as memo_router
@@ -20,6 +21,15 @@ api_v1 = NinjaAPI(
     description="API Set"
 )
 
+# UserAuth에서 발생한 토큰 에러를 기존 401 응답 형식으로 반환
+@api_v1.exception_handler(jwt.InvalidTokenError)
+def invalid_token_handler(request, exc):
+    return api_v1.create_response(
+        request,
+        HttpResp(resp_code=401, resp_msg=f'{exc}').dict(),
+        status=401
+    )
+
 api_v1.add_router("auth", auth_router)
 api_v1.add_router("garden", garden_router)
 api_v1.add_router("book", book_router)
@@ -1,5 +1,6 @@
 from datetime import datetime
 import logging
+from typing import List
 from ninja import File, Router, Schema
 from ninja.files import UploadedFile
 from pydantic import BaseModel, Field
@@ -40,11 +41,14 @@ class UpdateReadShema(Schema, BaseModel):
     book_start_date: datetime = Field(None, alias="book_start_date")
     book_end_date: datetime = Field(None, alias="book_end_date")
 
+class LookupBatchShema(Schema, BaseModel):
+    isbns: List[str] = Field(..., alias="isbns")
+
 
 @router.get(
     "/search",
     auth=UserAuth(),
-    response={200: DataResp, 400: HttpResp, 401: HttpResp, 500: HttpResp},
+    response={200: DataResp, 400: HttpResp, 401: HttpResp, 500: HttpResp, 503: HttpResp},
     summary="책 검색"
 )
 def get_book(request, query: str, start: int=1, maxResults: int=100):
@@ -58,7 +62,7 @@ def get_book(request, query: str, start: int=1, maxResults: int=100):
 @router.get(
     "/search-isbn",
     auth=UserAuth(),
-    response={200: DataResp, 400: HttpResp, 401: HttpResp, 500: HttpResp},
+    response={200: DataResp, 400: HttpResp, 401: HttpResp, 500: HttpResp, 503: HttpResp},
     summary="책 검색(ISBN)"
 )
 def get_isbn_book(request, query: str,):
@@ -69,10 +73,25 @@ def get_isbn_book(request, query: str,):
     return RETURN_FUNC(book_service.get_isbn_book(request, query))
 
 
+@router.post(
+    "/lookup-batch",
+    auth=UserAuth(),
+    response={200: DataResp, 400: HttpResp, 401: HttpResp, 500: HttpResp},
+    summary="책 일괄 조회(ISBN)"
+)
+def get_book_batch(request, form: LookupBatchShema):
+    """
+    * isbns: ISBN 목록 (최대 50개)
+    * data: ISBN별 isbn, resp_code(200/404/503), resp_msg, data(알라딘 응답)
+    """
+    logger.info(f"Call get_book_batch API")
+    return RETURN_FUNC(book_service.get_book_batch(request, form.dict()))
+
+
 @router.get(
     "/detail-isbn",
     auth=UserAuth(),
-    response={200: DataResp, 400: HttpResp, 401: HttpResp, 500: HttpResp},
+    response={200: DataResp, 400: HttpResp, 401: HttpResp, 500: HttpResp, 503: HttpResp},
     summary="책 상세 조회"
 )
 def get_book_detail(request, query: str):
@@ -93,7 +112,7 @@ def get_book_duplication(request, isbn: str):
     * isbn: ISBN13 입력 (9788937462788)
     """
     logger.info(f"Call get_book_duplication API")
-    return RETURN_FUNC(book_service.get_book_duplication(request, isbn))
+    return RETURN_FUNC(book_service.get_book_duplication(request.auth, isbn))
 
 @router.post(
     "/",
@@ -106,7 +125,7 @@ def create_book(request, form:CreateBookShema):
     * book_isbn: ISBN13 입력 (9788937462788)
     """
     logger.info(f"Call post_book API")
-    return RETURN_FUNC(book_service.create_book(request, form.dict()))
+    return RETURN_FUNC(book_service.create_book(request.auth, form.dict()))
 
 
 @router.delete(
@@ -117,7 +136,7 @@ def create_book(request, form:CreateBookShema):
 )
 def delete_book(request, book_no:int):
     logger.info(f"Call delete_book API")
-    return RETURN_FUNC(book_service.delete_book(request, book_no))
+    return RETURN_FUNC(book_service.delete_book(request.auth, book_no))
 
 
 @router.put(
@@ -128,7 +147,7 @@ def delete_book(request, book_no:int):
 )
 def update_book(request, form:UpdateBookShema, book_no: int):
     logger.info(f"Call update_book API")
-    return RETURN_FUNC(book_service.update_book(request, form.dict(), book_no))
+    return RETURN_FUNC(book_service.update_book(request.auth, form.dict(), book_no))
 
 
 @router.get(
@@ -137,14 +156,16 @@ def update_book(request, form:UpdateBookShema, book_no: int):
     response={200: DataResp, 400: HttpResp, 401: HttpResp, 500: HttpResp},
     summary="책 상태(목록) 리스트 조회"
 )
-def get_book_status(request, garden_no:int=None, status:int=None, page:int=1, page_size:int=10):
+def get_book_status(request, garden_no:int=None, status:int=None, page:int=1, page_size:int=10, cursor:str=None, use_cursor:bool=False, include_total:bool=True):
     """
     * book_image_url: 알라딘 표지
     * book_image_url2: 자체 표지
     * status: 0읽는중, 1읽은책, 2읽고싶은책, 3읽는중or읽은책
+    * use_cursor: true면 커서 페이지네이션 (page 대신 응답의 next_cursor를 cursor로 전달)
+    * include_total: false면 total_items, max_page 계산 생략
     """
     logger.info(f"Call get_book_status API")
-    return RETURN_FUNC(book_service.get_book_status(request,garden_no, status, page, page_size))
+    return RETURN_FUNC(book_service.get_book_status(request.auth,garden_no, status, page, page_size, cursor, use_cursor, include_total))
 
 @router.get(
     "/read",
@@ -158,7 +179,7 @@ def get_read(request, book_no:int):
     * book_image_url2: 자체 표지
     """
     logger.info(f"Call get_read API")
-    return RETURN_FUNC(book_service.get_read(request, book_no))
+    return RETURN_FUNC(book_service.get_read(request.auth, book_no))
 
 @router.post(
     "/read",
@@ -168,7 +189,7 @@ def get_read(request, book_no:int):
 )
 def create_read(request, form:CreateReadShema):
     logger.info(f"Call create_read API")
-    return RETURN_FUNC(book_service.create_read(request, form.dict()))
+    return RETURN_FUNC(book_service.create_read(request.auth, form.dict()))
 
 @router.put(
     "/read",
@@ -178,7 +199,7 @@ def create_read(request, form:CreateReadShema):
 )
 def update_read(request, form:UpdateReadShema, id:int):
     logger.info(f"Call update_read API")
-    return RETURN_FUNC(book_service.update_read(request, form.dict(), id))
+    return RETURN_FUNC(book_service.update_read(request.auth, form.dict(), id))
 
 @router.delete(
     "/read",
@@ -188,7 +209,7 @@ def update_read(request, form:UpdateReadShema, id:int):
 )
 def delete_read(request, id: int):
     logger.info(f"Call delete_read API")
-    return RETURN_FUNC(book_service.delete_read(request, id))
+    return RETURN_FUNC(book_service.delete_read(request.auth, id))
 
 @router.post(
     "/image",
@@ -198,7 +219,7 @@ def delete_read(request, id: int):
 )
 def upload_book_image(request, book_no:int, file: UploadedFile = File(...)):
     logger.info(f"Call upload_book_image API")
-    return RETURN_FUNC(book_service.upload_book_image(request, book_no, file))
+    return RETURN_FUNC(book_service.upload_book_image(request.auth, book_no, file))
 
 @router.delete(
     "/image",
@@ -208,7 +229,7 @@ def upload_book_image(request, book_no:int, file: UploadedFile = File(...)):
 )
 def delete_book_image(request, book_no:int):
     logger.info(f"Call delete_book_image API")
-    return RETURN_FUNC(book_service.delete_book_image(request, book_no))
+    return RETURN_FUNC(book_service.delete_book_image(request.auth, book_no))
 
 # @router.post(
 #     "/image",
@@ -218,7 +239,7 @@ def delete_book_image(request, book_no:int):
 # )
 # def upload_book_image(request, book_no:int, file: UploadedFile = File(...)):
 #     logger.info(f"Call upload_book_image API")
-#     return RETURN_FUNC(book_service.upload_book_image(request, book_no, file))
+#     return RETURN_FUNC(book_service.upload_book_image(request.auth, book_no, file))
 
 
 
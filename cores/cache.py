@@ -0,0 +1,133 @@
+import logging
+import threading
+import time
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+logger = logging.getLogger("django.server")
+
+
+class TTLCache:
+    """
+    LRU + TTL 인메모리 캐시 (스레드 안전)
+    """
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if (item := self._data.get(key)) is None:
+                return default
+
+            value, expires_at = item
+            # 만료된 항목은 삭제
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+
+            # 최근 사용 항목으로 이동
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl: float = None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+
+            # 최대 개수 초과시 가장 오래된 항목부터 삭제
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+
+class CountCache:
+    """
+    사용자별 목록 total 캐시
+
+    (scope, user_no) 아래에 필터별 count를 저장하고, 쓰기 시 사용자 단위로 한 번에 무효화
+    """
+    def __init__(self, maxsize: int, ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._lock = threading.Lock()
+
+    def count(self, scope: str, user_no, filters: tuple, query) -> int:
+        key = (scope, user_no)
+        if (total := (self._cache.get(key) or {}).get(filters)) is not None:
+            return total
+
+        total = query.order_by(None).count()
+        with self._lock:
+            counts = dict(self._cache.get(key) or {})
+            counts[filters] = total
+            self._cache.set(key, counts)
+        return total
+
+    def invalidate(self, scope: str, user_no):
+        self._cache.delete((scope, user_no))
+
+
+class StaleWhileRevalidateCache:
+    """
+    만료(fresh) 이후 stale 기간 동안은 이전 값을 바로 반환하고,
+    키당 하나의 백그라운드 갱신만 실행하는 캐시
+    """
+    def __init__(self, maxsize: int, max_workers: int = 2):
+        self._cache = TTLCache(maxsize=maxsize, ttl=0)
+        self._refreshing = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="cache-refresh")
+
+    def get_or_load(self, key, loader, ttl: float, stale_ttl: float,
+                    negative_ttl: float = None, is_negative=None):
+        if (entry := self._cache.get(key)) is not None:
+            value, fresh_until = entry
+            if fresh_until <= time.monotonic():
+                self._refresh(key, loader, ttl, stale_ttl, negative_ttl, is_negative)
+            return value
+
+        value = loader()
+        self._store(key, value, ttl, stale_ttl, negative_ttl, is_negative)
+        return value
+
+    def delete(self, key):
+        self._cache.delete(key)
+
+    def _store(self, key, value, ttl, stale_ttl, negative_ttl, is_negative):
+        # "없음" 응답은 더 짧게 캐시
+        if negative_ttl is not None and is_negative is not None and is_negative(value):
+            ttl = negative_ttl
+        self._cache.set(key, (value, time.monotonic() + ttl), ttl=ttl + stale_ttl)
+
+    def _refresh(self, key, loader, ttl, stale_ttl, negative_ttl, is_negative):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def task():
+            try:
+                self._store(key, loader(), ttl, stale_ttl, negative_ttl, is_negative)
+            except Exception as e:
+                logger.error(f"cache refresh failed for {key}: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        self._executor.submit(task)
@@ -0,0 +1,78 @@
+import logging
+import math
+import threading
+import time
+
+from concurrent.futures import ThreadPoolExecutor
+from passlib.context import CryptContext
+from passlib.hash import bcrypt
+
+from book import settings
+from cores.schema import ServiceError
+
+
+logger = logging.getLogger("django.server")
+
+
+class PasswordHasher:
+    """
+    bcrypt 해시/검증 전용 스레드 풀
+
+    동시에 처리(대기 포함)할 수 있는 작업 수를 제한하고,
+    가득 차면 기다리지 않고 바로 ServiceError(503)를 발생시킨다.
+    """
+    def __init__(self, max_workers: int, max_pending: int):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hasher")
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self._context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise ServiceError(503, "요청이 많아 처리할 수 없습니다. 잠시 후 다시 시도해주세요.")
+
+        try:
+            future = self._executor.submit(func, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+
+        return future.result()
+
+    def calibrate(self, target_seconds: float, min_rounds: int, max_rounds: int) -> int:
+        """
+        목표 시간에 가장 가까운(넘지 않는) bcrypt rounds를 측정해서 적용
+        """
+        started_at = time.perf_counter()
+        bcrypt.using(rounds=min_rounds).hash("calibration")
+        elapsed = time.perf_counter() - started_at
+
+        # rounds가 1 늘어날 때마다 시간이 2배
+        rounds = min_rounds + max(0, math.floor(math.log2(target_seconds / elapsed)))
+        rounds = min(rounds, max_rounds)
+
+        # rounds가 낮은 기존 해시는 needs_update에서 재해시 대상이 됨
+        self._context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+        logger.info(f"bcrypt rounds calibrated to {rounds} ({elapsed * 1000:.1f}ms at {min_rounds})")
+        return rounds
+
+    def hash(self, password):
+        return self._run(self._context.hash, password)
+
+    def verify(self, plain_password, hashed_password):
+        return self._run(self._context.verify, plain_password, hashed_password)
+
+    def needs_update(self, hashed_password):
+        return self._context.needs_update(hashed_password)
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASHER["MAX_WORKERS"],
+    max_pending=settings.PASSWORD_HASHER["MAX_PENDING"],
+)
+# 서버 시작 시 작업 비용 보정
+password_hasher.calibrate(
+    target_seconds=settings.PASSWORD_HASHER["TARGET_TIME"].total_seconds(),
+    min_rounds=settings.PASSWORD_HASHER["MIN_ROUNDS"],
+    max_rounds=settings.PASSWORD_HASHER["MAX_ROUNDS"],
+)
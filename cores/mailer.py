@@ -0,0 +1,196 @@
+import heapq
+import itertools
+import logging
+import queue
+import random
+import smtplib
+import threading
+import time
+
+from collections import deque
+from email.message import EmailMessage
+
+from book import settings
+from cores.schema import ServiceError
+
+
+logger = logging.getLogger("django.server")
+
+
+class EmailOutbox:
+    """
+    메일 발송 큐
+
+    요청에서는 메시지를 큐에 넣고 바로 반환하고,
+    백그라운드 스레드가 SMTP 연결을 유지하면서 배치로 전송한다.
+    일시적인 실패는 재시도 시각과 함께 재시도 힙에 넣어, 백오프 중에도 다른 메일은 계속 보낸다.
+    """
+    def __init__(self, host: str, port: int, account: str, password: str, timeout: float,
+                 max_queue: int, batch_size: int, max_retries: int, idle_timeout: float):
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.account = account
+        self.password = password
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.idle_timeout = idle_timeout
+
+        self._queue = queue.Queue(maxsize=max_queue)
+        # (재시도 시각, 순번, 시도 횟수, 메시지) - 발송 스레드에서만 사용
+        self._retries = []
+        self._retry_seq = itertools.count()
+        self._smtp = None
+        self._thread = None
+        self._lock = threading.Lock()
+
+        # 지표
+        self._latencies = deque(maxlen=1000)
+        self.sent_count = 0
+        self.failed_count = 0
+
+    def start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+                self._thread.start()
+
+    def enqueue(self, email, title, content):
+        message = EmailMessage()
+        message.set_content(content)
+
+        message["Subject"] = title
+        message["From"] = self.account
+        message["To"] = email
+
+        self.start()
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            raise ServiceError(503, "메일 발송 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+
+    def metrics(self) -> dict:
+        latencies = sorted(self._latencies)
+        return {
+            "queue_depth": self._queue.qsize(),
+            "retry_depth": len(self._retries),
+            "sent": self.sent_count,
+            "failed": self.failed_count,
+            "latency_avg_ms": (sum(latencies) / len(latencies) * 1000) if latencies else 0.0,
+            "latency_p95_ms": (latencies[int(len(latencies) * 0.95) - 1] * 1000) if latencies else 0.0,
+        }
+
+    def _connect(self):
+        smtp = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        smtp.login(self.account, self.password)
+        self._smtp = smtp
+
+    def _disconnect(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+    def _ensure_connection(self):
+        # 연결이 끊겼으면 재연결 + 재로그인
+        if self._smtp is not None:
+            try:
+                if self._smtp.noop()[0] == 250:
+                    return
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._disconnect()
+        self._connect()
+
+    def _is_permanent(self, e: Exception) -> bool:
+        # 수신자/발신자 거부, 5xx 응답은 재시도해도 실패
+        if isinstance(e, (smtplib.SMTPRecipientsRefused, smtplib.SMTPSenderRefused)):
+            return True
+        return isinstance(e, smtplib.SMTPResponseException) and 500 <= e.smtp_code < 600
+
+    def _send(self, message, attempt: int = 0):
+        try:
+            self._ensure_connection()
+            started_at = time.perf_counter()
+            self._smtp.send_message(message)
+            self._latencies.append(time.perf_counter() - started_at)
+            self.sent_count += 1
+            return
+        except (smtplib.SMTPException, OSError) as e:
+            logger.error(f"email send failed ({attempt + 1}/{self.max_retries + 1}) to {message['To']}: {e}")
+            if self._is_permanent(e):
+                # 연결은 정상이므로 RSET으로 세션만 초기화하고 유지
+                if self._smtp is not None:
+                    try:
+                        self._smtp.rset()
+                    except (smtplib.SMTPException, OSError):
+                        self._disconnect()
+            else:
+                self._disconnect()
+                if attempt < self.max_retries:
+                    # 지수 백오프 + jitter (발송 스레드는 기다리지 않고 다음 메일 처리)
+                    not_before = time.monotonic() + min(60, 2 ** attempt) + random.uniform(0, 1)
+                    heapq.heappush(self._retries, (not_before, next(self._retry_seq), attempt + 1, message))
+                    return
+
+        self.failed_count += 1
+
+    def _due_retries(self) -> list:
+        # 재시도 시각이 지난 메시지 (배치 크기까지)
+        due = []
+        now = time.monotonic()
+        while self._retries and self._retries[0][0] <= now and len(due) < self.batch_size:
+            _, _, attempt, message = heapq.heappop(self._retries)
+            due.append((message, attempt, False))
+        return due
+
+    def _wait_timeout(self) -> float:
+        # 다음 재시도 시각까지만 대기
+        if self._retries:
+            return max(0.0, min(self.idle_timeout, self._retries[0][0] - time.monotonic()))
+        return self.idle_timeout
+
+    def _run(self):
+        while True:
+            # (메시지, 시도 횟수, 큐에서 꺼냈는지)
+            batch = self._due_retries()
+            if not batch:
+                try:
+                    batch.append((self._queue.get(timeout=self._wait_timeout()), 0, True))
+                except queue.Empty:
+                    # 재시도 대기 없이 유휴 상태가 길면 연결 종료
+                    if not self._retries:
+                        self._disconnect()
+                    continue
+
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append((self._queue.get_nowait(), 0, True))
+                except queue.Empty:
+                    break
+
+            for message, attempt, from_queue in batch:
+                try:
+                    self._send(message, attempt)
+                except Exception as e:
+                    logger.error(e)
+                    self.failed_count += 1
+                finally:
+                    if from_queue:
+                        self._queue.task_done()
+
+            logger.info(f"email outbox {self.metrics()}")
+
+email_outbox = EmailOutbox(
+    host=settings.EMAIL_SMTP["HOST"],
+    port=settings.EMAIL_SMTP["PORT"],
+    account=settings.EMAIL_ACCOUNT,
+    password=settings.EMAIL_PASSWORD,
+    timeout=settings.EMAIL_SMTP["TIMEOUT"],
+    max_queue=settings.EMAIL_SMTP["MAX_QUEUE"],
+    batch_size=settings.EMAIL_SMTP["BATCH_SIZE"],
+    max_retries=settings.EMAIL_SMTP["MAX_RETRIES"],
+    idle_timeout=settings.EMAIL_SMTP["IDLE_TIMEOUT"].total_seconds(),
+)
@@ -0,0 +1,39 @@
+import bisect
+import threading
+
+
+class LatencyHistogram:
+    """
+    고정 구간(초) 지연 시간 히스토그램
+    """
+    DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counts = [0] * (len(self.buckets) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        with self._lock:
+            self._counts[bisect.bisect_left(self.buckets, seconds)] += 1
+            self._sum += seconds
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counts = list(self._counts)
+            total = self._sum
+
+        # 누적 개수 (le: 이하)
+        buckets = {}
+        cumulative = 0
+        for bucket, n in zip(self.buckets + ("inf",), counts):
+            cumulative += n
+            buckets[f"le_{bucket}"] = cumulative
+
+        return {
+            "count": cumulative,
+            "sum": total,
+            "avg": (total / cumulative) if cumulative else 0.0,
+            "buckets": buckets,
+        }
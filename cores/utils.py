@@ -1,19 +1,22 @@
+import base64
+import json
 import random
-import smtplib
 import string
 
 import logging
 import jwt
 
-from passlib.context import CryptContext
+from datetime import datetime
 from functools import wraps
 from typing import TypeVar
-from sqlalchemy import create_engine
+from sqlalchemy import and_, create_engine, or_
 from sqlalchemy.orm import sessionmaker, scoped_session, Query
-from email.message import EmailMessage
 
 from book import settings
-from cores.schema import HttpResp
+from cores.cache import CountCache
+from cores.hasher import password_hasher
+from cores.mailer import email_outbox
+from cores.schema import HttpResp, ServiceError
 
 GenericPayload = TypeVar("GenericPayload")
 logger = logging.getLogger("django.server")
@@ -25,6 +28,12 @@ Session = sessionmaker(
 )
 SessionLocal = scoped_session(Session)
 
+# 목록 API total 캐시 (book, memo)
+count_cache = CountCache(
+    maxsize=settings.COUNT_CACHE["MAXSIZE"],
+    ttl=settings.COUNT_CACHE["TTL"].total_seconds(),
+)
+
 def session_wrapper(func):
     @wraps(func)
     def wrapped(self, *args, **kwargs):
@@ -41,34 +50,9 @@ def session_wrapper(func):
         
     return wrapped
 
-# 5분 후 인증번호 초기화
-def reset_auth_number(user_instance):
-    logger.info(f'reset_auth_number 함수가 실행되었습니다.')
-    with SessionLocal() as session:
-        user_instance.user_auth_number = None
-
-        session.add(user_instance)
-        session.commit()
-        session.refresh(user_instance)
-
-# 메일 전송
+# 메일 전송 (발송 큐에 넣고 바로 반환)
 def send_email(email, title, content):
-    gmail_smtp = 'smtp.gmail.com'
-    gmail_port = 465
-    smtp = smtplib.SMTP_SSL(gmail_smtp, gmail_port)
-    sender_account = settings.EMAIL_ACCOUNT
-    sender_password = settings.EMAIL_PASSWORD
-    smtp.login(sender_account, sender_password)
-    
-    message = EmailMessage()
-    message.set_content(content)
-    
-    message["Subject"] = title
-    message["From"] = sender_account
-    message["To"] = email
-
-    smtp.send_message(message) 
-    smtp.quit()
+    email_outbox.enqueue(email, title, content)
 
 # 영문과 숫자 랜덤 조합
 def generate_random_string(length):
@@ -98,20 +82,28 @@ def generate_random_nick() -> str:
     return nick
 
 
-# 암호화 컨텍스트 설정
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-# 비밀번호 암호화
+# 비밀번호 암호화 (해시 전용 스레드 풀에서 실행)
 def hash_password(password):
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 # 비밀번호 검증
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify(plain_password, hashed_password)
+# 비밀번호 재해시 필요 여부 (작업 비용 변경 등)
+def password_needs_update(hashed_password):
+    return password_hasher.needs_update(hashed_password)
 
 
 # 페이지네이션
-def pagination(query: Query, page: int, page_size: int):
- total_items = query.count()
- max_page = (total_items + page_size - 1) // page_size
+def pagination(query: Query, page: int, page_size: int, include_total: bool = True, total: int = None):
+ """
+ include_total: False면 count를 생략 (total, max_page는 None)
+ total: 미리 계산된(캐시된) total이 있으면 count 대신 사용
+ """
+ total_items = None
+ max_page = None
+ if include_total:
+    total_items = query.count() if total is None else total
+    max_page = (total_items + page_size - 1) // page_size
  offset = (page - 1) * page_size # 현재 페이지에 대한 오프셋 계산
 
  paginated_items = (
@@ -128,5 +120,78 @@ def pagination(query: Query, page: int, page_size: int):
     "page_size": page_size,
     "list": paginated_items
  }
+
+
+# 커서 토큰 인코딩 (정렬 키 값 -> 불투명 문자열)
+def encode_cursor(values: list) -> str:
+    raw = json.dumps([
+        {"dt": v.isoformat()} if isinstance(v, datetime) else v
+        for v in values
+    ])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+# 커서 토큰 디코딩
+def decode_cursor(cursor: str) -> list:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        return [
+            datetime.fromisoformat(v["dt"]) if isinstance(v, dict) else v
+            for v in json.loads(raw)
+        ]
+    except (ValueError, TypeError, KeyError):
+        raise ServiceError(400, "유효하지 않은 커서입니다.")
+
+# row(엔티티 또는 (엔티티, ...) 튜플)에서 정렬 키 값 추출
+def _cursor_value(row, column):
+    entity = row
+    if not isinstance(row, column.class_):
+        entity = next(e for e in row if isinstance(e, column.class_))
+    return getattr(entity, column.key)
+
+# 커서(keyset) 페이지네이션
+def cursor_pagination(query: Query, sort_keys: list, cursor: str, page_size: int, include_total: bool = False, total: int = None):
+ """
+ sort_keys: [(컬럼, 내림차순 여부), ...] - 마지막 키는 유일해야 함 (PK 등)
+ cursor: 이전 응답의 next_cursor (첫 페이지는 None)
+
+ OFFSET 없이 마지막 행의 정렬 키 이후부터 조회하므로 페이지 깊이와 무관하게 일정한 비용
+ """
+ total_items = None
+ if include_total:
+    total_items = query.order_by(None).count() if total is None else total
+
+ if cursor:
+    values = decode_cursor(cursor)
+    if len(values) != len(sort_keys):
+        raise ServiceError(400, "유효하지 않은 커서입니다.")
+
+    # (k1 < v1) OR (k1 = v1 AND k2 < v2) OR ... (정렬 방향에 따라 < / >)
+    conditions = []
+    for i, (column, descending) in enumerate(sort_keys):
+        equals = [sort_keys[j][0] == values[j] for j in range(i)]
+        after = column < values[i] if descending else column > values[i]
+        conditions.append(and_(*equals, after))
+    query = query.filter(or_(*conditions))
+
+ rows = (
+    query
+    .order_by(None)
+    .order_by(*[column.desc() if descending else column.asc() for column, descending in sort_keys])
+    .limit(page_size + 1)  # 다음 페이지 존재 여부 확인용 1건 추가 조회
+    .all()
+ )
+ has_next = len(rows) > page_size
+ rows = rows[:page_size]
+
+ return {
+    "next_cursor": (
+        encode_cursor([_cursor_value(rows[-1], column) for column, _ in sort_keys])
+        if has_next else None
+    ),
+    "has_next": has_next,
+    "total": total_items,
+    "page_size": page_size,
+    "list": rows
+ }
     
 RETURN_FUNC = lambda r: (r.resp_code, r)
\ No newline at end of file
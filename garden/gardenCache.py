@@ -0,0 +1,61 @@
+import logging
+
+from sqlalchemy import update
+
+from book import settings
+from cores.cache import TTLCache
+from garden.models import Garden, GardenUser
+
+
+logger = logging.getLogger("django.server")
+
+# garden_no -> (garden_version, 가든 상세 응답)
+garden_detail_cache = TTLCache(
+    maxsize=settings.GARDEN_DETAIL_CACHE["MAXSIZE"],
+    ttl=settings.GARDEN_DETAIL_CACHE["TTL"].total_seconds(),
+)
+
+
+def bump_garden_version(session, *garden_nos):
+    """
+    가든 상세에 영향을 주는 쓰기에서 호출 (호출한 쪽 트랜잭션에서 커밋)
+    """
+    if not (garden_nos := {garden_no for garden_no in garden_nos if garden_no is not None}):
+        return
+    session.execute(
+        update(Garden)
+        .where(Garden.garden_no.in_(garden_nos))
+        .values(garden_version=Garden.garden_version + 1),
+        execution_options={"synchronize_session": False}
+    )
+
+
+def bump_user_garden_versions(session, user_no):
+    """
+    유저가 가입된 모든 가든의 버전 증가 (멤버 정보 변경, 탈퇴 등)
+    """
+    session.execute(
+        update(Garden)
+        .where(Garden.garden_no.in_(
+            session.query(GardenUser.garden_no).filter(GardenUser.user_no == user_no)
+        ))
+        .values(garden_version=Garden.garden_version + 1),
+        execution_options={"synchronize_session": False}
+    )
+
+
+def garden_etag(garden_no, garden_version) -> str:
+    return f'"{garden_no}-{garden_version}"'
+
+
+def get_cached_garden_detail(garden_no, garden_version):
+    # 버전이 같을 때만 캐시 사용
+    if (cached := garden_detail_cache.get(garden_no)) is not None:
+        cached_version, result = cached
+        if cached_version == garden_version:
+            return result
+    return None
+
+
+def set_cached_garden_detail(garden_no, garden_version, result):
+    garden_detail_cache.set(garden_no, (garden_version, result))
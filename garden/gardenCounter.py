@@ -0,0 +1,96 @@
+import logging
+
+from sqlalchemy import func, select, update
+
+from auths.models import User
+from book import settings
+from book.models import Book
+from cores.utils import session_wrapper
+from garden.models import Garden, GardenUser
+
+
+logger = logging.getLogger("django.server")
+
+
+class GardenCounter:
+    """
+    유저별 가든 수, 가든별 멤버 수, 가든별 책 수 카운터
+
+    개수 제한은 행을 불러와 len()으로 세지 않고
+    UPDATE ... SET count = count + n WHERE count + n <= 제한 한 문장으로 확인한다 (동시 요청에도 초과하지 않음).
+    호출한 쪽 트랜잭션에서 커밋한다.
+    """
+    def _change(self, session, model, key_column, key, count_column, delta: int, limit: int = None, minimum: int = None) -> bool:
+        statement = (
+            update(model)
+            .where(key_column == key)
+            .values({count_column: func.greatest(count_column + delta, 0)})
+        )
+        if limit is not None:
+            statement = statement.where(count_column + delta <= limit)
+        if minimum is not None:
+            statement = statement.where(count_column + delta >= minimum)
+        return session.execute(statement, execution_options={"synchronize_session": False}).rowcount > 0
+
+    def lock_gardens(self, session, *garden_nos):
+        """
+        여러 가든 카운터를 바꾸기 전 가든 행 잠금 (데드락 방지를 위해 garden_no 순)
+        """
+        if not (garden_nos := sorted({garden_no for garden_no in garden_nos if garden_no is not None})):
+            return
+        session.query(Garden.garden_no).filter(
+            Garden.garden_no.in_(garden_nos)
+        ).order_by(Garden.garden_no).with_for_update().all()
+
+    def change_user_gardens(self, session, user_no, delta: int, limit: int = None, minimum: int = None) -> bool:
+        return self._change(session, User, User.user_no, user_no, User.user_garden_count, delta, limit, minimum)
+
+    def change_garden_members(self, session, garden_no, delta: int, limit: int = None) -> bool:
+        return self._change(session, Garden, Garden.garden_no, garden_no, Garden.garden_member_count, delta, limit)
+
+    def change_garden_books(self, session, garden_no, delta: int, limit: int = None) -> bool:
+        if garden_no is None or delta == 0:
+            return True
+        return self._change(session, Garden, Garden.garden_no, garden_no, Garden.garden_book_count, delta, limit)
+
+    def acquire_user_garden(self, session, user_no) -> bool:
+        return self.change_user_gardens(session, user_no, 1, limit=settings.GARDEN_LIMIT["GARDENS_PER_USER"])
+
+    def acquire_garden_member(self, session, garden_no) -> bool:
+        return self.change_garden_members(session, garden_no, 1, limit=settings.GARDEN_LIMIT["MEMBERS_PER_GARDEN"])
+
+    def acquire_garden_books(self, session, garden_no, count: int = 1) -> bool:
+        return self.change_garden_books(session, garden_no, count, limit=settings.GARDEN_LIMIT["BOOKS_PER_GARDEN"])
+
+    @session_wrapper
+    def rebuild(self, session):
+        """
+        실제 행 수로 카운터 재계산 (컬럼 추가 후 1회, 또는 불일치 복구용)
+        """
+        session.execute(
+            update(User).values(user_garden_count=(
+                select(func.count(GardenUser.id))
+                .where(GardenUser.user_no == User.user_no)
+                .scalar_subquery()
+            )),
+            execution_options={"synchronize_session": False}
+        )
+        session.execute(
+            update(Garden).values(
+                garden_member_count=(
+                    select(func.count(GardenUser.id))
+                    .where(GardenUser.garden_no == Garden.garden_no)
+                    .scalar_subquery()
+                ),
+                garden_book_count=(
+                    select(func.count(Book.book_no))
+                    .where(Book.garden_no == Garden.garden_no)
+                    .scalar_subquery()
+                ),
+            ),
+            execution_options={"synchronize_session": False}
+        )
+        session.commit()
+        logger.info("garden counters rebuilt")
+
+garden_counter = GardenCounter()
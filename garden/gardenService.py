@@ -1,17 +1,19 @@
 import logging
-import os
-import jwt
 
-from sqlalchemy import asc, desc
+from sqlalchemy import asc, desc, func
 from auths.models import User
-from auths.tokenService import token_service
-from book.models import Book, BookImage, BookRead
+from auths.userLoader import user_loader
+from book.models import Book
+from book.cascadeService import cascade_service
+from book.imageGcService import image_gc_service
+from book.readProgress import latest_current_pages, read_percent
 from cores.schema import DataResp, HttpResp
 from sqlalchemy.orm import aliased
 
-from cores.utils import GenericPayload, session_wrapper
+from cores.utils import GenericPayload, count_cache, session_wrapper
+from garden.gardenCounter import garden_counter
+from garden.gardenCache import bump_garden_version, garden_etag, get_cached_garden_detail, set_cached_garden_detail
 from garden.models import Garden, GardenUser
-from memo.models import Memo, MemoImage
 from push.pushService import push_service
 
 
@@ -19,36 +21,25 @@ logger = logging.getLogger("django.server")
 
 class GardenService:
     @session_wrapper
-    def create_garden(self, session, request, payload: GenericPayload):
+    def create_garden(self, session, token_payload, payload: GenericPayload):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
-            # 가든 개수 가져오기
-            garden_user_instance_count = len(session.query(GardenUser).filter(GardenUser.user_no == user_instance.user_no).all())
-
-            if garden_user_instance_count < 5:
+            # 가든 개수 제한 (카운터 조건부 증가)
+            if garden_counter.acquire_user_garden(session, user_instance.user_no):
                 # 새로운 가든 객체 생성
                 new_garden_dict = {
                     **payload,
+                    "garden_member_count": 1,
                 }
                 new_garden = Garden(
                     **new_garden_dict
                 )
                 session.add(new_garden)
-                session.commit()
-                session.refresh(new_garden)
+                session.flush()
 
                 # 새로운 가든-유저 객체 생성
                 new_garden_user_dict = {
@@ -74,32 +65,21 @@ class GardenService:
                 )
             
             else:
+                session.rollback()
                 return HttpResp(resp_code=403, resp_msg="가든 생성 개수 초과")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')    
         except Exception as e:
             logger.error(e)
             raise e
 
 
     @session_wrapper
-    def get_garden_detail(self, session, request, garden_no: int):
+    def get_garden_detail(self, session, token_payload, garden_no: int, if_none_match: str = None, response_headers=None):
+        """
+        가든 상세 조회 (response_headers가 있으면 ETag 설정)
+        """
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -110,7 +90,21 @@ class GardenService:
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 가든 정보가 없습니다.")
             
-            result = garden_instance.as_dict()
+            etag = garden_etag(garden_no, garden_instance.garden_version)
+            if response_headers is not None:
+                response_headers["ETag"] = etag
+
+            # 클라이언트가 가진 버전과 같으면 본문 없이 응답
+            if if_none_match == etag:
+                return HttpResp(resp_code=304, resp_msg="가든 상세 변경 없음")
+
+            # 같은 버전의 캐시가 있으면 그대로 반환
+            if (result := get_cached_garden_detail(garden_no, garden_instance.garden_version)) is not None:
+                return DataResp(
+                    resp_code=200, resp_msg="가든 상세 조회 성공", data=result)
+
+            # 카운터, 버전 컬럼은 응답에서 제외
+            result = garden_instance.as_dict(exclude=["garden_member_count", "garden_book_count", "garden_version"])
             
             # Book 가져오기
             book_instance = (
@@ -119,18 +113,13 @@ class GardenService:
                 .all()
             )
             
+            # 책별 최근 독서 기록 (한 번에 조회)
+            current_pages = latest_current_pages(session, [book.book_no for book in book_instance])
+
             book_list = []
 
             for book in book_instance:
-                percent = 0.0
-                if (
-                    book_read_instance := 
-                    session.query(BookRead)
-                    .filter(BookRead.book_no == book.book_no)
-                    .order_by(desc(BookRead.created_at))
-                    .first()
-                ):
-                    percent = (book_read_instance.book_current_page/book.book_page)*100
+                percent = read_percent(current_pages.get(book.book_no), book.book_page)
                 
                 book_list.append({
                         'book_no': book.book_no,
@@ -175,34 +164,20 @@ class GardenService:
                  )
 
             result['garden_members'] = garden_members_list
+            set_cached_garden_detail(garden_no, garden_instance.garden_version, result)
 
             return DataResp(
                 resp_code=200, resp_msg="가든 상세 조회 성공", data=result)
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')           
         except Exception as e:
             logger.error(e)
             raise e
         
 
     @session_wrapper
-    def get_garden(self, session, request):
+    def get_garden(self, session, token_payload):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -210,34 +185,54 @@ class GardenService:
 
             # GardenUser 클래스에 대한 별칭 생성
             garden_user_alias = aliased(GardenUser)
-            # Garden, GardenUser join
+
+            # 유저가 가입된 가든 번호
+            user_garden_nos = (
+                session.query(GardenUser.garden_no)
+                .filter(GardenUser.user_no == user_instance.user_no)
+            )
+            # 가든별 멤버 수
+            member_counts = (
+                session.query(GardenUser.garden_no, func.count(GardenUser.id).label("member_count"))
+                .filter(GardenUser.garden_no.in_(user_garden_nos))
+                .group_by(GardenUser.garden_no)
+                .subquery()
+            )
+            # 가든별 책 수
+            book_counts = (
+                session.query(Book.garden_no, func.count(Book.book_no).label("book_count"))
+                .filter(Book.garden_no.in_(user_garden_nos))
+                .group_by(Book.garden_no)
+                .subquery()
+            )
+
+            # Garden, GardenUser join + 멤버 수, 책 수 (한 번에 조회)
             gardens = (
-                session.query(Garden)
+                session.query(
+                    Garden,
+                    func.coalesce(member_counts.c.member_count, 0),
+                    func.coalesce(book_counts.c.book_count, 0)
+                )
                 .join(
                 garden_user_alias, garden_user_alias.garden_no == Garden.garden_no
             )
+            .outerjoin(member_counts, member_counts.c.garden_no == Garden.garden_no)
+            .outerjoin(book_counts, book_counts.c.garden_no == Garden.garden_no)
             .filter(garden_user_alias.user_no == user_instance.user_no)
             # True인 항목이 먼저 오도록 내림차순 정렬
             .order_by(desc(garden_user_alias.garden_main))
             .all()
             )
 
-            for garden in gardens:
-                # garden 멤버 가져오기
-                garden_members = session.query(garden_user_alias).filter(garden_user_alias.garden_no == garden.garden_no).all()
-
-                # Book 가져오기
-                book_instance_count = len(session.query(Book).filter(Book.garden_no == garden.garden_no).all())
-                
-
+            for garden, member_count, book_count in gardens:
                 result.append(
                     {
                         'garden_no': garden.garden_no,
                         'garden_title': garden.garden_title,
                         'garden_info': garden.garden_info,
                         'garden_color': garden.garden_color,
-                        'garden_members': len(garden_members),
-                        'book_count': book_instance_count,
+                        'garden_members': member_count,
+                        'book_count': book_count,
                         'garden_created_at': garden.garden_created_at,
                     }
                 )
@@ -246,31 +241,16 @@ class GardenService:
             return DataResp(
                 resp_code=200, resp_msg="가든 리스트 조회 성공", data=result
             )
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')    
         except Exception as e:
             logger.error(e)
             raise e
 
 
     @session_wrapper
-    def update_garden(self, session, request, payload: GenericPayload, garden_no: int):
+    def update_garden(self, session, token_payload, payload: GenericPayload, garden_no: int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -287,37 +267,23 @@ class GardenService:
             garden_instacne.garden_color = payload['garden_color']
 
             session.add(garden_instacne)
+            bump_garden_version(session, garden_no)
             session.commit()
             session.refresh(garden_instacne)
             
             return DataResp(
                 resp_code=200, resp_msg="가든 수정 성공", data={}
             )
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')    
         except Exception as e:
             logger.error(e)
             raise e
         
 
     @session_wrapper
-    def delete_garden(self, session, request, garden_no: int):
+    def delete_garden(self, session, token_payload, garden_no: int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -328,74 +294,38 @@ class GardenService:
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 가든 정보가 없습니다.")
             
-            # 가든이 1개 이하면
-            if not (
-                len(session.query(GardenUser)
-                .filter(GardenUser.user_no == user_instance.user_no)
-                .all()) > 1
-            ):
+            # 가든이 1개 이하면 (카운터 조건부 감소)
+            if not garden_counter.change_user_gardens(session, user_instance.user_no, -1, minimum=1):
+                session.rollback()
                 return HttpResp(resp_code=403, resp_msg="가든 삭제 불가")
             
             garden_user_instance = session.query(GardenUser).filter(GardenUser.garden_no == garden_no, GardenUser.user_no == user_instance.user_no).first()
 
-            # 가든에 있는 책 삭제
-            book_instance = session.query(Book).filter(Book.garden_no == garden_no, Book.user_no == user_instance.user_no).all()
-            for book in book_instance:
-                # 책 기록 삭제
-                session.query(BookRead).filter(BookRead.book_no == book.book_no).delete()
-                # 책 이미지 삭제
-                book_image_instance = session.query(BookImage).filter(BookImage.book_no == book.book_no).first()
-                if book_image_instance:
-                    try:
-                        os.remove('images/'+book_image_instance.image_url)
-                        session.delete(book_image_instance)
-                    except FileNotFoundError:
-                        pass
-                session.delete(book)
-                # 메모 삭제
-                memo_instance = session.query(Memo).filter(Memo.book_no == book.book_no).all()
-                for memo in memo_instance:
-                    memo_image_instance = session.query(MemoImage).filter(MemoImage.memo_no == memo.id).first()
-                    if memo_image_instance:
-                        try:
-                            os.remove('images/'+memo_image_instance.image_url)
-                            session.delete(memo_image_instance)
-                        except FileNotFoundError:
-                            pass
-                    session.delete(memo)
+            # 가든에 있는 책 일괄 삭제 (독서 기록, 이미지, 메모 포함)
+            image_urls = cascade_service.delete_books(session, Book.garden_no == garden_no, Book.user_no == user_instance.user_no)
 
+            bump_garden_version(session, garden_no)
             session.delete(garden_instance)
             session.delete(garden_user_instance)
             session.commit()
+            # 서버에 저장된 이미지 삭제 대기
+            image_gc_service.enqueue(session, image_urls)
+            count_cache.invalidate("book", user_instance.user_no)
+            count_cache.invalidate("memo", user_instance.user_no)
             
             return HttpResp(
                 resp_code=200, resp_msg="가든 삭제 성공"
             )
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')    
         except Exception as e:
             logger.error(e)
             raise e
         
     
     @session_wrapper
-    def move_garden(self, session, request, garden_no: int, to_garden_no:int):
+    def move_garden(self, session, token_payload, garden_no: int, to_garden_no:int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -413,48 +343,42 @@ class GardenService:
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 도착지 가든 정보가 없습니다.")
             
-            # 책 옮기기
-            book_instance = session.query(Book).filter(Book.garden_no == garden_no, Book.user_no == user_instance.user_no).all() # 현재 
-            book_instance2 = session.query(Book).filter(Book.garden_no == to_garden_no).all() # 도착지 가든의 책 인스턴스
+            # 두 가든 행 잠금 (옮기는 동안 현재 가든에 책이 추가되지 않고, 반대 방향 이동과 데드락이 나지 않도록 번호 순)
+            garden_counter.lock_gardens(session, garden_no, to_garden_no)
+
+            # 옮길 책 수
+            move_book_count = session.query(func.count(Book.book_no)).filter(
+                Book.garden_no == garden_no, Book.user_no == user_instance.user_no
+            ).scalar()
 
-            # 도착지 가든 + 현재 책 합 30개 이하만 가능
-            if len(book_instance)+len(book_instance2) > 30:
+            # 도착지 가든 + 현재 책 합 30개 이하만 가능 (카운터 조건부 증가)
+            if not garden_counter.acquire_garden_books(session, to_garden_no, move_book_count):
+                session.rollback()
                 return HttpResp(resp_code=403, resp_msg="가든 옮기기 불가")
+            garden_counter.change_garden_books(session, garden_no, -move_book_count)
             
-            for book in book_instance:
-                book.garden_no = to_garden_no
-                session.add(book)
+            # 책 옮기기 (단일 UPDATE)
+            session.query(Book).filter(
+                Book.garden_no == garden_no, Book.user_no == user_instance.user_no
+            ).update({Book.garden_no: to_garden_no}, synchronize_session=False)
 
+            bump_garden_version(session, garden_no, to_garden_no)
             session.commit()
+            count_cache.invalidate("book", user_instance.user_no)
             
             return HttpResp(
                 resp_code=200, resp_msg="가든 책 이동 성공"
             )
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')    
         except Exception as e:
             logger.error(e)
             raise e
         
 
     @session_wrapper
-    def delete_garden_member(self, session, request, garden_no: int):
+    def delete_garden_member(self, session, token_payload, garden_no: int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -467,29 +391,17 @@ class GardenService:
             
             garden_user_instance = session.query(GardenUser).filter(GardenUser.garden_no == garden_no, GardenUser.user_no == user_instance.user_no).first()
 
-            # 가든에 있는 책 삭제
-            book_instance = session.query(Book).filter(Book.garden_no == garden_no, Book.user_no == user_instance.user_no).all()
-            for book in book_instance:
-                # 책 이미지 삭제
-                book_image_instance = session.query(BookImage).filter(BookImage.book_no == book.book_no).first()
-                if book_image_instance:
-                    try:
-                        os.remove('images/'+book_image_instance.image_url)
-                        session.delete(book_image_instance)
-                    except FileNotFoundError:
-                        pass
-                session.delete(book)
-                # 메모 삭제
-                memo_instance = session.query(Memo).filter(Memo.book_no == book.book_no).all()
-                for memo in memo_instance:
-                    memo_image_instance = session.query(MemoImage).filter(MemoImage.memo_no == memo.id).first()
-                    if memo_image_instance:
-                        try:
-                            os.remove('images/'+memo_image_instance.image_url)
-                            session.delete(memo_image_instance)
-                        except FileNotFoundError:
-                            pass
-                    session.delete(memo)
+            # 가든에 있는 책 수 (카운터 감소용)
+            book_count = session.query(func.count(Book.book_no)).filter(
+                Book.garden_no == garden_no, Book.user_no == user_instance.user_no
+            ).scalar()
+
+            # 가든에 있는 책 일괄 삭제 (독서 기록, 이미지, 메모 포함)
+            image_urls = cascade_service.delete_books(session, Book.garden_no == garden_no, Book.user_no == user_instance.user_no)
+
+            garden_counter.change_garden_books(session, garden_no, -book_count)
+            garden_counter.change_garden_members(session, garden_no, -1)
+            garden_counter.change_user_gardens(session, user_instance.user_no, -1)
 
             # 현재 대표 -> 위임
             if garden_user_instance.garden_leader:
@@ -498,40 +410,28 @@ class GardenService:
                 garden_user_instance2.garden_leader = True
 
                 session.add(garden_user_instance2)
-                session.commit()
-                session.refresh(garden_user_instance2)
 
+            bump_garden_version(session, garden_no)
             session.delete(garden_user_instance)
             session.commit()
+            # 서버에 저장된 이미지 삭제 대기
+            image_gc_service.enqueue(session, image_urls)
+            count_cache.invalidate("book", user_instance.user_no)
+            count_cache.invalidate("memo", user_instance.user_no)
             
             return HttpResp(
                 resp_code=200, resp_msg="가든 탈퇴 성공"
             )
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')    
         except Exception as e:
             logger.error(e)
             raise e
         
 
     @session_wrapper
-    def update_garden_leader(self, session, request, garden_no: int, user_no:int):
+    def update_garden_leader(self, session, token_payload, garden_no: int, user_no:int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -552,36 +452,22 @@ class GardenService:
                 garden_user_instance2.garden_leader = True
 
                 session.add(garden_user_instance2)
+                bump_garden_version(session, garden_no)
                 session.commit()
                 session.refresh(garden_user_instance2)
             
             return HttpResp(
                 resp_code=200, resp_msg="가든 멤버 변경 성공"
             )
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')    
         except Exception as e:
             logger.error(e)
             raise e
         
     @session_wrapper
-    def update_garden_main(self, session, request, garden_no: int):
+    def update_garden_main(self, session, token_payload, garden_no: int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -610,30 +496,15 @@ class GardenService:
             return HttpResp(
                 resp_code=200, resp_msg="가든 메인 변경 성공"
             )
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')    
         except Exception as e:
             logger.error(e)
             raise e
         
     @session_wrapper
-    def create_garden_invite(self, session, request, garden_no: int):
+    def create_garden_invite(self, session, token_payload, garden_no: int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -652,10 +523,10 @@ class GardenService:
             ):
                 return HttpResp(resp_code=409, resp_msg="이미 가입된 가든")
             
-            # 가든 유저 개수 가져오기
-            garden_user_instance_count = len(session.query(GardenUser).filter(GardenUser.garden_no == garden_no).all())
-            
-            if garden_user_instance_count < 10 :
+            # 가든 멤버 수 제한 (카운터 조건부 증가)
+            if garden_counter.acquire_garden_member(session, garden_no):
+                garden_counter.change_user_gardens(session, user_instance.user_no, 1)
+
                 # 새로운 가든-유저 객체 생성
                 new_garden_user_dict = {
                     "garden_no" : garden_no,
@@ -667,30 +538,20 @@ class GardenService:
                         **new_garden_user_dict
                 )
                 session.add(new_garden_user)
+                bump_garden_version(session, garden_no)
                 session.commit()
                 session.refresh(new_garden_user)
 
-                # 가든에 있는 유저들
-                if (
-                garden_user_instance := session.query(GardenUser)
-                .filter(GardenUser.garden_no == garden_no, GardenUser.user_no != user_instance.user_no)
-                .all()
-                ):
-                    for garden_user in garden_user_instance:
-                        push_service.send_new_member_push(garden_user.user_no, garden_no)
+                # 가든에 있는 유저들에게 알림 (백그라운드 전송)
+                push_service.enqueue_new_member_push(garden_no, user_instance.user_no)
                 
                 return HttpResp(
                     resp_code=201, resp_msg="가든 초대 완료"
                 )
             
             else: 
+                session.rollback()
                 return HttpResp(resp_code=403, resp_msg="가든 멤버 초과")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')    
         except Exception as e:
             logger.error(e)
             raise e
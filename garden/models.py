@@ -15,6 +15,11 @@ class Garden(GardenBase, UtilModel):
     garden_info = Column(String(200), nullable=False)
     garden_color = Column(String(20), nullable=False)
     garden_created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
+    # 가든 상세에 영향을 주는 쓰기마다 증가 (상세 캐시, ETag)
+    garden_version = Column(Integer, nullable=False, default=0, server_default="0")
+    # 개수 제한용 카운터 (GARDEN_USER, BOOK 행 수)
+    garden_member_count = Column(Integer, nullable=False, default=0, server_default="0")
+    garden_book_count = Column(Integer, nullable=False, default=0, server_default="0")
 
 class GardenUser(GardenBase, UtilModel):
     __tablename__ = "GARDEN_USER"
@@ -1,4 +1,5 @@
 import logging
+from django.http import HttpResponse
 from django.shortcuts import render
 from ninja import Router, Schema
 from pydantic import BaseModel, Field
@@ -24,7 +25,7 @@ class GardenSchema(Schema, BaseModel):
     summary="가든 추가"
 )
 def create_garden(request, form: GardenSchema):
-    return RETURN_FUNC(garden_service.create_garden(request, form.dict()))
+    return RETURN_FUNC(garden_service.create_garden(request.auth, form.dict()))
 
 
 @router.get(
@@ -34,17 +35,23 @@ def create_garden(request, form: GardenSchema):
     summary="가든 리스트 조회"
 )
 def get_garden(request):
-    return RETURN_FUNC(garden_service.get_garden(request))
+    return RETURN_FUNC(garden_service.get_garden(request.auth))
 
 
 @router.get(
     "/detail",
     auth=UserAuth(),
-    response={200: DataResp, 400: HttpResp, 401: HttpResp, 500: HttpResp},
+    response={200: DataResp, 304: None, 400: HttpResp, 401: HttpResp, 500: HttpResp},
     summary="가든 상세 조회"
 )
-def get_garden_detail(request, garden_no: int):
-    return RETURN_FUNC(garden_service.get_garden_detail(request, garden_no))
+def get_garden_detail(request, response: HttpResponse, garden_no: int):
+    """
+    * ETag: garden_version (If-None-Match가 같으면 304)
+    """
+    result = garden_service.get_garden_detail(request.auth, garden_no, request.headers.get("If-None-Match"), response.headers)
+    if result.resp_code == 304:
+        return 304, None
+    return RETURN_FUNC(result)
 
 
 @router.put(
@@ -54,7 +61,7 @@ def get_garden_detail(request, garden_no: int):
     summary="가든 수정"
 )
 def update_garden(request, form: GardenSchema, garden_no: int):
-    return RETURN_FUNC(garden_service.update_garden(request, form.dict(), garden_no))
+    return RETURN_FUNC(garden_service.update_garden(request.auth, form.dict(), garden_no))
 
 
 @router.delete(
@@ -64,7 +71,7 @@ def update_garden(request, form: GardenSchema, garden_no: int):
     summary="가든 삭제"
 )
 def delete_garden(request, garden_no: int):
-    return RETURN_FUNC(garden_service.delete_garden(request, garden_no))
+    return RETURN_FUNC(garden_service.delete_garden(request.auth, garden_no))
 
 @router.put(
     "/to",
@@ -73,7 +80,7 @@ def delete_garden(request, garden_no: int):
     summary="가든 책 이동"
 )
 def move_garden(request, garden_no: int, to_garden_no:int):
-    return RETURN_FUNC(garden_service.move_garden(request, garden_no, to_garden_no))
+    return RETURN_FUNC(garden_service.move_garden(request.auth, garden_no, to_garden_no))
 
 
 @router.delete(
@@ -83,7 +90,7 @@ def move_garden(request, garden_no: int, to_garden_no:int):
     summary="가든 탈퇴"
 )
 def delete_garden_member(request, garden_no: int):
-    return RETURN_FUNC(garden_service.delete_garden_member(request, garden_no))
+    return RETURN_FUNC(garden_service.delete_garden_member(request.auth, garden_no))
 
 @router.put(
     "/member",
@@ -92,7 +99,7 @@ def delete_garden_member(request, garden_no: int):
     summary="가든 대표 변경"
 )
 def update_garden_leader(request, garden_no: int, user_no:int):
-    return RETURN_FUNC(garden_service.update_garden_leader(request, garden_no, user_no))
+    return RETURN_FUNC(garden_service.update_garden_leader(request.auth, garden_no, user_no))
 
 @router.put(
     "/main",
@@ -101,7 +108,7 @@ def update_garden_leader(request, garden_no: int, user_no:int):
     summary="가든 메인 변경"
 )
 def update_garden_main(request, garden_no: int):
-    return RETURN_FUNC(garden_service.update_garden_main(request, garden_no))
+    return RETURN_FUNC(garden_service.update_garden_main(request.auth, garden_no))
 
 @router.post(
     "/invite",
@@ -110,6 +117,6 @@ def update_garden_main(request, garden_no: int):
     summary="가든 초대 완료"
 )
 def create_garden_invite(request, garden_no: int):
-    return RETURN_FUNC(garden_service.create_garden_invite(request, garden_no))
+    return RETURN_FUNC(garden_service.create_garden_invite(request.auth, garden_no))
 
 
@@ -1,17 +1,16 @@
 import logging
-import os
-import secrets
-import jwt
 
 from datetime import datetime
-from auths.models import User
-from auths.tokenService import token_service
+from auths.userLoader import user_loader
 from book import settings
+from book.cascadeService import cascade_service
+from book.imageGcService import image_gc_service
+from book.imageStore import image_store, thumbnail_urls
 from book.models import Book, BookRead
-from cores.schema import DataResp, HttpResp
+from cores.schema import DataResp, HttpResp, ServiceError
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 
-from cores.utils import GenericPayload, pagination, session_wrapper
+from cores.utils import GenericPayload, count_cache, cursor_pagination, pagination, session_wrapper
 from garden.models import Garden, GardenUser
 from memo.models import Memo, MemoImage
 
@@ -19,19 +18,10 @@ logger = logging.getLogger("django.server")
 
 class MemoService:
     @session_wrapper
-    def create_memo(self, session, request, payload: GenericPayload):
+    def create_memo(self, session, token_payload, payload: GenericPayload):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -48,35 +38,21 @@ class MemoService:
             session.add(new_memo)
             session.commit()
             session.refresh(new_memo)
+            count_cache.invalidate("memo", user_instance.user_no)
 
             return DataResp(resp_code=201, resp_msg="메모 추가 성공", data={
                 'id': new_memo.id
             })
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
     
 
     @session_wrapper
-    def update_memo(self, session, request, payload: GenericPayload, id:int):
+    def update_memo(self, session, token_payload, payload: GenericPayload, id:int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
                         
@@ -99,31 +75,16 @@ class MemoService:
             session.refresh(memo_instance)
                 
             return HttpResp(resp_code=200, resp_msg="메모 수정 성공")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
         
 
     @session_wrapper
-    def delete_memo(self, session, request, id:int):
+    def delete_memo(self, session, token_payload, id:int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -132,45 +93,23 @@ class MemoService:
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 메모가 없습니다.")
             
-            if (
-                image_instance := session.query(MemoImage)
-                .filter(MemoImage.memo_no == id)
-                .first()
-            ):
-                # 서버, DB 저장된 이미지 삭제
-                os.remove('images/'+image_instance.image_url)    
-                session.delete(image_instance)
-                session.commit()
-            
-            session.delete(memo_instance)
+            # 메모, 메모 이미지 삭제 (서버 파일은 커밋 후 삭제 대기)
+            image_urls = cascade_service.delete_memos(session, Memo.id == memo_instance.id)
             session.commit()
+            image_gc_service.enqueue(session, image_urls)
+            count_cache.invalidate("memo", user_instance.user_no)
             
             return HttpResp(resp_code=200, resp_msg="메모 삭제 성공")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
         
 
     @session_wrapper
-    def get_memo(self, session, request, page: int = 1, page_size : int = 10):
+    def get_memo(self, session, token_payload, page: int = 1, page_size : int = 10, cursor: str = None, use_cursor: bool = False, include_total: bool = True):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
 
@@ -179,11 +118,37 @@ class MemoService:
                 session.query(Memo, Book)
                 .join(Book, Book.book_no == Memo.book_no)
                 .filter(Memo.user_no == user_instance.user_no)
-                .order_by(Memo.memo_like.desc(), Memo.memo_created_at.desc())
+                .order_by(Memo.memo_like.desc(), Memo.memo_created_at.desc(), Memo.id.desc())
             )
 
-            # 페이지네이션 적용 (예: 1페이지, 페이지당 10개 항목)
-            pagination_result = pagination(memo_book_query, page, page_size)
+            # total은 사용자 단위로 캐시 (include_total=false면 count 생략)
+            total = count_cache.count("memo", user_instance.user_no, (), memo_book_query) if include_total else None
+
+            if use_cursor or cursor:
+                # 커서 페이지네이션 (memo_like, memo_created_at, id 순)
+                pagination_result = cursor_pagination(
+                    memo_book_query,
+                    [(Memo.memo_like, True), (Memo.memo_created_at, True), (Memo.id, True)],
+                    cursor,
+                    page_size,
+                    include_total,
+                    total
+                )
+            else:
+                # 페이지네이션 적용 (예: 1페이지, 페이지당 10개 항목)
+                pagination_result = pagination(memo_book_query, page, page_size, include_total, total)
+
+            # 페이지 메모들의 이미지 (IN 쿼리 한 번)
+            # memo_no -> (image_url, thumbnail_ready)
+            memo_images = {}
+            if (memo_ids := [memo.id for memo, book in pagination_result['list']]):
+                for memo_no, image_url, thumbnail_ready in (
+                    session.query(MemoImage.memo_no, MemoImage.image_url, MemoImage.thumbnail_ready)
+                    .filter(MemoImage.memo_no.in_(memo_ids))
+                    .order_by(MemoImage.id.asc())
+                    .all()
+                ):
+                    memo_images.setdefault(memo_no, (image_url, thumbnail_ready))
 
             # 페이지네이션된 결과에서 메모 리스트 추출
             memo_list = [                
@@ -196,53 +161,44 @@ class MemoService:
                     'memo_content': memo.memo_content,
                     # 'memo_quote': memo.memo_quote,
                     'memo_like': memo.memo_like,
-                    'image_url': (
-                        (image_instance.image_url if image_instance else '')
-                        if (image_instance := session.query(MemoImage)
-                            .filter(MemoImage.memo_no == memo.id)
-                            .first())
-                        else None
-                    ),
+                    'image_url': memo_images.get(memo.id, (None, False))[0],
+                    'thumbnail_urls': thumbnail_urls(*memo_images.get(memo.id, (None, False))),
                     'memo_created_at': memo.memo_created_at
                 }
                 for memo, book in pagination_result['list']
             ]
 
             # Result with pagination details
-            result = {
-                "current_page": pagination_result["current_page"],
-                "max_page": pagination_result["max_page"],
-                "total": pagination_result["total"],
-                "page_size": pagination_result["page_size"],
-                "list": memo_list
-            }
+            if use_cursor or cursor:
+                result = {
+                    "next_cursor": pagination_result["next_cursor"],
+                    "has_next": pagination_result["has_next"],
+                    "total": pagination_result["total"],
+                    "page_size": pagination_result["page_size"],
+                    "list": memo_list
+                }
+            else:
+                result = {
+                    "current_page": pagination_result["current_page"],
+                    "max_page": pagination_result["max_page"],
+                    "total": pagination_result["total"],
+                    "page_size": pagination_result["page_size"],
+                    "list": memo_list
+                }
 
             return DataResp(resp_code=200, resp_msg="메모 리스트 조회 성공", data=result)
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
+        except ServiceError as e:
+            return HttpResp(resp_code=e.code, resp_msg=e.msg)
         except Exception as e:
             logger.error(e)
             raise e
         
 
     @session_wrapper
-    def get_memo_detail(self, session, request, id:int):
+    def get_memo_detail(self, session, token_payload, id:int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -256,6 +212,7 @@ class MemoService:
 
             image_instance = session.query(MemoImage).filter(MemoImage.memo_no == id).first()
             image_url = image_instance.image_url if image_instance else None
+            thumbnail_ready = image_instance.thumbnail_ready if image_instance else False
 
             result = {
                     'id': memo.id,
@@ -267,35 +224,21 @@ class MemoService:
                     'memo_content': memo.memo_content,
                     # 'memo_quote': memo.memo_quote,
                     'image_url': image_url,
+                    'thumbnail_urls': thumbnail_urls(image_url, thumbnail_ready),
                     'memo_created_at': memo.memo_created_at
             }
             
             return DataResp(resp_code=200, resp_msg="메모 상세 조회 성공", data=result)
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
         
 
     @session_wrapper
-    def like_memo(self, session, request, id:int):
+    def like_memo(self, session, token_payload, id:int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -311,31 +254,16 @@ class MemoService:
             session.refresh(memo_instance)
             
             return HttpResp(resp_code=200, resp_msg="메모 즐겨찾기 추가/해제")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
         
 
     @session_wrapper
-    def upload_memo_image(self, session, request, id:int, file):
+    def upload_memo_image(self, session, token_payload, id:int, file):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -344,37 +272,19 @@ class MemoService:
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 메모가 없습니다.")
 
-            # 해당 메모에 이미지 있으면
+            # 임시 파일 스트리밍 저장 -> 형식 확인 -> rename
+            image_url = image_store.save(file, settings.MEMO_IMAGE_DIR, 'memo/')
+
+            # 해당 메모에 이미지 있으면 DB에서 삭제 (서버 파일은 커밋 후 삭제 대기)
+            old_image_urls = []
             if (
                 image_instance := session.query(MemoImage)
                 .filter(MemoImage.memo_no == id)
                 .first()
             ):  
-                # 서버, DB 저장된 이미지 삭제
-                os.remove('images/'+image_instance.image_url)
+                old_image_urls.append(image_instance.image_url)
                 session.delete(image_instance)
-                session.commit()
             
-            image_folder = settings.MEMO_IMAGE_DIR
-
-            try:
-                os.mkdir(image_folder)
-            except FileExistsError:
-                pass
-
-            if file.size > (5 * 1024 * 1024):
-                return HttpResp(resp_code=400, resp_msg="이미지 용량은 5MB를 초과할 수 없습니다.")
-                
-            name, ext = os.path.splitext(file.name) # 파일 이름에서 확장자를 분리
-            image_name = secrets.token_urlsafe(16) + ext # URL 안전한 임의의 문자열을 생성
-            image_path = image_folder + "/" + image_name
-
-            with open(image_path, 'wb+') as f:
-                for chunk in file.chunks():
-                    f.write(chunk)
-
-            image_url = 'memo/' + image_name
-
             new_image = MemoImage(
                 memo_no = id,
                 image_name = file.name,
@@ -384,33 +294,23 @@ class MemoService:
             session.add(new_image)
             session.commit()
             session.refresh(new_image)
+            image_gc_service.enqueue(session, old_image_urls)
+            # 이미지 행 커밋 후 썸네일 생성 (완료되면 thumbnail_ready 표시)
+            image_store.make_thumbnails_later(image_url)
 
             return HttpResp(resp_code=201, resp_msg="이미지 업로드 성공")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
+        except ServiceError as e:
+            return HttpResp(resp_code=e.code, resp_msg=e.msg)
         except Exception as e:
             logger.error(e)
             raise e
         
     
     @session_wrapper
-    def delete_memo_image(self, session, request, id:int):
+    def delete_memo_image(self, session, token_payload, id:int):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -427,23 +327,13 @@ class MemoService:
             ):  
                 return HttpResp(resp_code=400, resp_msg="일치하는 이미지가 없습니다.")
             
-            if os.path.exists('images/'+image_instance.image_url):
-                try:
-                    # 서버, DB 저장된 이미지 삭제
-                    os.remove('images/'+image_instance.image_url)
-                except Exception as e:
-                    print(e)
-
+            # DB 저장된 이미지 삭제 (서버 파일은 커밋 후 삭제 대기)
+            image_url = image_instance.image_url
             session.delete(image_instance)                        
             session.commit()
+            image_gc_service.enqueue(session, [image_url])
 
             return HttpResp(resp_code=201, resp_msg="이미지 삭제 성공")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
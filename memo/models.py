@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, DateTime, Integer, String, Text, func
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, Text, func
 from sqlalchemy.orm import DeclarativeBase
 from cores.models import UtilModel
 
@@ -17,6 +17,11 @@ class Memo(MemoBase, UtilModel):
     memo_like = Column(Boolean, nullable=False, default=False)    
     memo_created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
 
+    # 메모 리스트 정렬/커서 페이지네이션용
+    __table_args__ = (
+        Index("ix_memo_user_like_created", "user_no", "memo_like", "memo_created_at", "id"),
+    )
+
 class MemoImage(MemoBase, UtilModel):
     __tablename__ = "MEMO_IMAGE"
 
@@ -24,4 +29,6 @@ class MemoImage(MemoBase, UtilModel):
     memo_no = Column(Integer, nullable=False)
     image_name = Column(Text, nullable=False)
     image_url = Column(Text, nullable=False)
+    # 썸네일 생성 완료 여부 (리스트 응답에서 파일 확인 없이 썸네일 URL 사용)
+    thumbnail_ready = Column(Boolean, nullable=False, default=False, server_default="0")
     image_created_at = Column(DateTime(timezone=True), default=func.now(), nullable=False)
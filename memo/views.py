@@ -25,7 +25,7 @@ class MemoShema(Schema, BaseModel):
 )
 def create_memo(request, form:MemoShema):
     logger.info(f"Call create_memo API")
-    return RETURN_FUNC(memo_service.create_memo(request, form.dict()))
+    return RETURN_FUNC(memo_service.create_memo(request.auth, form.dict()))
 
 @router.put(
     "/",
@@ -35,7 +35,7 @@ def create_memo(request, form:MemoShema):
 )
 def update_memo(request, form:MemoShema, id:int):
     logger.info(f"Call update_memo API")
-    return RETURN_FUNC(memo_service.update_memo(request, form.dict(), id))
+    return RETURN_FUNC(memo_service.update_memo(request.auth, form.dict(), id))
  
 @router.delete(
     "/",
@@ -45,7 +45,7 @@ def update_memo(request, form:MemoShema, id:int):
 )
 def delete_memo(request, id:int):
     logger.info(f"Call delete_memo API")
-    return RETURN_FUNC(memo_service.delete_memo(request, id))
+    return RETURN_FUNC(memo_service.delete_memo(request.auth, id))
 
 @router.get(
     "/",
@@ -53,9 +53,13 @@ def delete_memo(request, id:int):
     response={200: DataResp, 400: HttpResp, 401: HttpResp, 500: HttpResp},
     summary="메모 리스트 조회"
 )
-def get_memo(request, page: int = 1, page_size: int = 10):
+def get_memo(request, page: int = 1, page_size: int = 10, cursor: str = None, use_cursor: bool = False, include_total: bool = True):
+    """
+    * use_cursor: true면 커서 페이지네이션 (page 대신 응답의 next_cursor를 cursor로 전달)
+    * include_total: false면 total, max_page 계산 생략
+    """
     logger.info(f"Call get_memo API")
-    return RETURN_FUNC(memo_service.get_memo(request, page, page_size))
+    return RETURN_FUNC(memo_service.get_memo(request.auth, page, page_size, cursor, use_cursor, include_total))
 
 @router.get(
     "/detail",
@@ -65,7 +69,7 @@ def get_memo(request, page: int = 1, page_size: int = 10):
 )
 def get_memo_detail(request, id:int):
     logger.info(f"Call get_memo_detail API")
-    return RETURN_FUNC(memo_service.get_memo_detail(request, id))
+    return RETURN_FUNC(memo_service.get_memo_detail(request.auth, id))
 
 @router.put(
     "/like",
@@ -75,7 +79,7 @@ def get_memo_detail(request, id:int):
 )
 def like_memo(request, id:int):
     logger.info(f"Call like_memo API")
-    return RETURN_FUNC(memo_service.like_memo(request, id))
+    return RETURN_FUNC(memo_service.like_memo(request.auth, id))
 
 @router.post(
     "/image",
@@ -85,7 +89,7 @@ def like_memo(request, id:int):
 )
 def upload_memo_image(request, id:int, file: UploadedFile = File(...)):
     logger.info(f"Call upload_memo_image API")
-    return RETURN_FUNC(memo_service.upload_memo_image(request, id, file))
+    return RETURN_FUNC(memo_service.upload_memo_image(request.auth, id, file))
 
 @router.delete(
     "/image",
@@ -95,4 +99,4 @@ def upload_memo_image(request, id:int, file: UploadedFile = File(...)):
 )
 def delete_memo_image(request, id:int):
     logger.info(f"Call delete_memo_image API")
-    return RETURN_FUNC(memo_service.delete_memo_image(request, id))
\ No newline at end of file
+    return RETURN_FUNC(memo_service.delete_memo_image(request.auth, id))
\ No newline at end of file
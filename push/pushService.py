@@ -1,7 +1,7 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import json
 import logging
-import jwt
 import firebase_admin
 
 from firebase_admin import messaging
@@ -10,31 +10,25 @@ from google.auth.transport.requests import Request
 import requests
 
 from auths.models import User
-from auths.tokenService import token_service
+from auths.userLoader import user_loader
 from book import settings
 from cores.schema import DataResp, HttpResp
 from cores.utils import GenericPayload, session_wrapper
-from garden.models import Garden
+from garden.models import Garden, GardenUser
 from push.models import Push
 
 
 logger = logging.getLogger("django.server")
 
+# 요청 처리 후 보내는 푸시 (가든 새 멤버 알림 등)
+push_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="push-fanout")
+
 class PushService:
     @session_wrapper
-    def get_push(self, session, request):
+    def get_push(self, session, token_payload):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -43,30 +37,15 @@ class PushService:
             result = push_instance.to_dict()
             
             return DataResp(resp_code=200, resp_msg="푸시 알림 조회 성공", data=result)
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
         
     @session_wrapper
-    def update_push(self, session, request, payload: GenericPayload):
+    def update_push(self, session, token_payload, payload: GenericPayload):
         try:
-            token = request.headers.get("Authorization")
-            if token is not None:
-                token = token.split(" ")[1]
-            else:
-                return HttpResp(resp_code=500, resp_msg="유효하지 않은 토큰 값입니다.")
-            
-            token_payload = token_service.verify_access_token(token)
             if not(
-                user_instance := session.query(User)
-                .filter(User.user_no == token_payload['user_no'])
-                .first()
+                user_instance := user_loader.get_user(session, token_payload['user_no'])
             ):
                 return HttpResp(resp_code=400, resp_msg="일치하는 사용자 정보가 없습니다.")
             
@@ -84,12 +63,6 @@ class PushService:
             session.refresh(push_instance)
             
             return HttpResp(resp_code=200, resp_msg="푸시 알림 수정 성공")
-        except (
-            jwt.ExpiredSignatureError,
-            jwt.InvalidTokenError,
-            jwt.DecodeError
-        ) as e:
-            return HttpResp(resp_code=401, resp_msg=f'{e}')        
         except Exception as e:
             logger.error(e)
             raise e
@@ -111,10 +84,10 @@ class PushService:
         raise e
 
     # FCM 메시지를 단일 토큰으로 전송
-    def send_fcm(self, token, title, body, data):
+    def send_fcm(self, token, title, body, data, access_token=None, http=requests):
         url = f"https://fcm.googleapis.com/v1/projects/{settings.FIREBASE_PROJECT_ID}/messages:send"
         headers = {
-            "Authorization": f"Bearer {self.get_access_token()}",
+            "Authorization": f"Bearer {access_token or self.get_access_token()}",
             "Content-Type": "application/json",
         }
         # 메시지 요청 데이터
@@ -130,56 +103,64 @@ class PushService:
         }
 
         # HTTP 요청 전송
-        response = requests.post(url, headers=headers, data=json.dumps(message))
+        response = http.post(url, headers=headers, data=json.dumps(message), timeout=10)
         return response.json() if response.status_code == 200 else response.text
 
-    # 여러 토큰에 FCM 메시지를 전송
+    # 여러 토큰에 FCM 메시지를 전송 (액세스 토큰, HTTP 연결 재사용)
     def send_multicast_fcm(self, tokens, title, body, data):
         results = []
-        for token in tokens:
-            if token:  # 유효한 토큰만 전송
-                result = self.send_fcm(token, title, body, data)
-                results.append(result)
+        if not (tokens := [token for token in tokens if token]):  # 유효한 토큰만 전송
+            return results
+
+        access_token = self.get_access_token()
+        with requests.Session() as http:
+            for token in tokens:
+                try:
+                    results.append(self.send_fcm(token, title, body, data, access_token, http))
+                except requests.RequestException as e:
+                    logger.error(e)
+                    results.append(str(e))
         return results
     
     
+    def enqueue_new_member_push(self, garden_no, new_user_no):
+        """
+        가든 가입 커밋 후 호출 - 기존 멤버 알림은 백그라운드에서 전송
+        """
+        push_executor.submit(self.send_new_member_push, garden_no, new_user_no)
+
     @session_wrapper
-    def send_new_member_push(self, session, user_no, garden_no):
+    def send_new_member_push(self, session, garden_no, new_user_no):
         try:
-            # User, Push join
+            # 가든의 기존 멤버 FCM 토큰, 가든 이름 (한 번에 조회)
             user_push_instance = (
-                session.query(User, Push)
+                session.query(User.user_fcm, Garden.garden_title)
+                .join(GardenUser, GardenUser.user_no == User.user_no)
+                .join(Garden, Garden.garden_no == GardenUser.garden_no)
                 .join(Push, Push.user_no == User.user_no)
-                .filter(User.user_no == user_no, Push.push_app_ok == True).
-                all()
+                .filter(
+                    GardenUser.garden_no == garden_no,
+                    GardenUser.user_no != new_user_no,
+                    Push.push_app_ok == True
+                )
+                .all()
             )
 
-            tokens = []
-
-            for user, push in user_push_instance:
-                tokens.append(user.user_fcm)
-                        
-
             # 빈 값 제거 및 유효한 토큰 필터링
-            tokens = [token for token in tokens if token and isinstance(token, str) and token.strip()]
+            tokens = [user_fcm for user_fcm, _ in user_push_instance if user_fcm and isinstance(user_fcm, str) and user_fcm.strip()]
 
             results = []
 
-            # 해당 가든 가져오기
-            garden_instance = (
-                session.query(Garden)
-                .filter(Garden.garden_no == garden_no)
-                .first()
-            )
-
             # 멀티캐스트 FCM 메시지 전송
             if tokens:
+                garden_title = user_push_instance[0][1]
                 title = 'NEW 가드너 등장🧑‍🌾'
-                body =  f'{garden_instance.garden_title}에 새로운 멤버가 들어왔어요. 함께 책을 읽어 가든을 채워주세요'
+                body =  f'{garden_title}에 새로운 멤버가 들어왔어요. 함께 책을 읽어 가든을 채워주세요'
                 data = {"garden_no": str(garden_no)}
                 results = self.send_multicast_fcm(tokens, title, body, data)
 
-                return DataResp(resp_code=200, resp_msg="새 멤버 알림 푸시 전송 성공" , data=results)
+            logger.info(f"new member push sent garden {garden_no}: {len(results)} tokens")
+            return DataResp(resp_code=200, resp_msg="새 멤버 알림 푸시 전송 성공" , data=results)
         except Exception as e:
             logger.error(e)
             raise e
@@ -2,8 +2,14 @@ import logging
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.events import EVENT_JOB_EXECUTED, EVENT_JOB_ERROR
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
 
+from auths.authCodeService import auth_code_service
+from auths.tokenService import token_service
+from book.catalogService import catalog_service
+from book.imageGcService import image_gc_service
+from book.imageStore import image_store
 from push.views import send_book_push
 from push.pushService import push_service
 
@@ -20,6 +26,24 @@ def start_scheduler():
     # 매 분 정각(초가 0일 때) send_book_push 함수를 실행
     scheduler.add_job(push_service.send_book_push, CronTrigger(second="0"))
 
+    # 1시간마다 만료된 refresh token 정리
+    scheduler.add_job(token_service.purge_expired_refresh_tokens, IntervalTrigger(hours=1))
+
+    # 10분마다 만료된 비밀번호 찾기 인증번호 정리
+    scheduler.add_job(auth_code_service.purge_expired_codes, IntervalTrigger(minutes=10))
+
+    # 매일 새벽 4시 오래된 책 카탈로그 갱신
+    scheduler.add_job(catalog_service.refresh_stale, CronTrigger(hour="4", minute="0"))
+
+    # 1분마다 삭제 대기 중인 이미지 파일 정리
+    scheduler.add_job(image_gc_service.collect, IntervalTrigger(minutes=1))
+
+    # 매일 새벽 5시 고아 이미지 파일 회수
+    scheduler.add_job(image_gc_service.reconcile, CronTrigger(hour="5", minute="0"))
+
+    # 매일 새벽 5시 30분 썸네일이 없는 이미지 썸네일 생성
+    scheduler.add_job(image_store.backfill_thumbnails, CronTrigger(hour="5", minute="30"))
+
     # 에러 또는 성공 처리 이벤트
     def job_listener(event):
         if event.exception:
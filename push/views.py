@@ -26,7 +26,7 @@ def get_push(request):
     푸시 알림 조회
     """
     logger.info(f"Call get_push API")
-    return RETURN_FUNC(push_service.get_push(request))
+    return RETURN_FUNC(push_service.get_push(request.auth))
 
 @router.put("/",
             auth=UserAuth(),
@@ -37,7 +37,7 @@ def update_push(request, form: UpdatePushShema):
     푸시 알림 수정
     """
     logger.info(f"Call create_push API")
-    return RETURN_FUNC(push_service.update_push(request, form.dict()))
+    return RETURN_FUNC(push_service.update_push(request.auth, form.dict()))
 
 @router.post("/book",
             response={200: DataResp, 400: HttpResp, 500: HttpResp}, 